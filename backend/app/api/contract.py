@@ -4,15 +4,21 @@ from typing import Generator, Optional
 import uuid
 from pathlib import Path 
 from beanie import PydanticObjectId
-from fastapi import APIRouter, Body, File, HTTPException, Query, Request, UploadFile
+from fastapi import APIRouter, Body, File, HTTPException, Query, Request, Response, UploadFile
 from fastapi.responses import HTMLResponse, StreamingResponse
 from app.minio import DocumentBucket
-from app.models.documentUploaded import ContractDocument, ContractStatus
+from app.models.documentUploaded import ContractStatus, PayloadKind
 from app.services.extractor import DocumentExtractor, document_extraction_worker
 from app.repositories.contract import ContractRepository
 from app.services.agent import agent
 from app.services.segmenter import  extract_clauses
-from app.services.compliance_check import check_compliance, convert_clauses_for_compliance
+from app.services.compliance_check import SpecialistAgentError, convert_clauses_for_compliance
+from app.services.incremental_compliance import check_compliance_incremental
+from app.services.template_matcher import TemplateMatcher
+from app.services.numeric_limits import NumericCheck, validate_numeric_limits
+from app.dto.policy import CoverageReport, NumericCheckReport
+from app.dto.contract import ContractDetail, ContractSummary, ContractUpdateResponse
+from app.config import settings
 
 
 router = APIRouter(prefix="/contract", tags=["Contract"])
@@ -27,11 +33,7 @@ async def get_signed_url():
         expires_in_seconds=20
     )
 
-    contract_doc = ContractDocument(
-        file_name=file_name,
-        file_id=file_id,
-    )
-    await contract_doc.insert()
+    await ContractRepository.create_contract(file_name=file_name, file_id=file_id)
 
     html = f"""
     <html>
@@ -112,7 +114,7 @@ async def get_signed_url():
     """
     return HTMLResponse(content=html)
 
-@router.post("/upload-contract", description="Upload contract image, PDF, text, or handwriting", response_model=ContractDocument)
+@router.post("/upload-contract", description="Upload contract image, PDF, text, or handwriting", response_model=ContractDetail)
 async def upload_contract(
     request: Request,
 ):
@@ -152,17 +154,16 @@ async def upload_contract(
     else:
         raise HTTPException(status_code=400, detail="Either a file or content must be provided.")
     
-    contract_doc = ContractDocument(
+    print(f"Creating contract: name={final_file_name}, category={category}")
+    contract_doc = await ContractRepository.create_contract(
         file_name=final_file_name,
         file_id=file_id,
-        category=category,
         content=extracted_data,
+        category=category,
     )
-    print(f"Creating contract: name={contract_doc.file_name}, category={category}")
-    await contract_doc.insert()
-    
+
     # Return the document - FastAPI will serialize it properly with response_model
-    return contract_doc
+    return ContractDetail(**contract_doc.model_dump(), content=extracted_data)
 
 
 @router.post("/{contract_id}/extract-clauses")
@@ -171,7 +172,7 @@ async def extract_clauses_endpoint(contract_id: PydanticObjectId):
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
 
-    raw_text = contract.content
+    raw_text = await ContractRepository.get_content(contract_id)
     print(raw_text)
     extraction_performed = False
     if not raw_text:
@@ -179,15 +180,15 @@ async def extract_clauses_endpoint(contract_id: PydanticObjectId):
             raise HTTPException(status_code=400, detail="No file name")
 
     try:
-        result = extract_clauses(raw_text)
+        result = await extract_clauses(raw_text)
         clauses_data = [clause.model_dump() for clause in result.clauses]
 
-        await contract.update({
-            "$set": {
-                "clauses": clauses_data,
-                "status": ContractStatus.UNDER_REVIEW
-            }
-        })
+        await ContractRepository.set_payload(
+            contract_id,
+            PayloadKind.CLAUSES,
+            clauses_data,
+            {"status": ContractStatus.UNDER_REVIEW.value},
+        )
 
         return clauses_data
 
@@ -197,12 +198,18 @@ async def extract_clauses_endpoint(contract_id: PydanticObjectId):
     
     
 @router.post("/{contract_id}/compliance-check")
-async def compliance_check_endpoint(contract_id: PydanticObjectId):
+async def compliance_check_endpoint(
+    contract_id: PydanticObjectId,
+    fan_out: Optional[bool] = Query(None, description="Send each specialist only its clause groups; defaults to settings.COMPLIANCE_FAN_OUT"),
+    full: bool = Query(False, description="Re-evaluate every clause instead of only new or changed ones"),
+    prescreen: Optional[bool] = Query(None, description="Skip specialists with no local risk signal; defaults to settings.COMPLIANCE_PRESCREEN_ENABLED"),
+):
     contract = await ContractRepository.get_contract_by_id(contract_id)
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
     
-    if not contract.clauses or len(contract.clauses) == 0:
+    contract_clauses = await ContractRepository.get_clauses(contract_id)
+    if not contract_clauses:
         raise HTTPException(
             status_code=400,
             detail="No clauses found. Run extraction first."
@@ -210,16 +217,18 @@ async def compliance_check_endpoint(contract_id: PydanticObjectId):
     
     try:
         print("x\n"*10)
-        print(f"Checking compliance for contract {contract_id}, clauses: {len(contract.clauses)}")
+        print(f"Checking compliance for contract {contract_id}, clauses: {len(contract_clauses)}")
 
-        clauses = convert_clauses_for_compliance(contract.clauses)
+        clauses = convert_clauses_for_compliance(contract_clauses)
 
         print(f"Converted clauses: {len(clauses)}")
         
-        result = check_compliance(
+        result = await check_compliance_incremental(
             clauses=clauses,
             contract_id=str(contract_id),
-            collection_name="company_policies"
+            fan_out=fan_out,
+            full=full,
+            prescreen=prescreen,
         )
         
         # Serialize findings to dict format
@@ -235,13 +244,12 @@ async def compliance_check_endpoint(contract_id: PydanticObjectId):
             new_status = ContractStatus.UNDER_REVIEW
         
         # Update contract with new schema
-        await contract.update({
-            "$set": {
-                "risks": findings,  # Store as findings now
-                "compliance_score": compliance_score,
-                "status": new_status,
-            }
-        })
+        await ContractRepository.set_payload(
+            contract_id,
+            PayloadKind.RISKS,
+            findings,  # Store as findings now
+            {"compliance_score": compliance_score, "status": new_status.value},
+        )
         
         # Return comprehensive result
         return {
@@ -251,9 +259,20 @@ async def compliance_check_endpoint(contract_id: PydanticObjectId):
             "compliance_score": compliance_score,
             "executive_summary": result.executive_summary,
             "recommendation": result.recommendation,
-            "required_actions": result.required_actions
+            "required_actions": result.required_actions,
+            "agents_used": result.agents_used,
+            "failed_agents": result.failed_agents,
+            "skipped_agents": result.skipped_agents,
+            "clauses_evaluated": result.clauses_evaluated,
+            "clauses_reused": result.clauses_reused,
         }
-        
+
+    except SpecialistAgentError as e:
+        # Agent outage, not a verdict on the contract: keep its status as is
+        raise HTTPException(
+            status_code=503,
+            detail=f"Compliance check unavailable: {str(e)}"
+        )
     except Exception as e:
         await contract.update({
             "$set": {"status": ContractStatus.REJECTED}
@@ -263,48 +282,133 @@ async def compliance_check_endpoint(contract_id: PydanticObjectId):
             detail=f"Compliance check failed: {str(e)}"
         )
         
-@router.get("/{contract_id}", response_model=ContractDocument)
-async def get_contract(contract_id: PydanticObjectId):
+@router.get("/{contract_id}/template-coverage", response_model=CoverageReport)
+async def template_coverage_endpoint(
+    contract_id: PydanticObjectId,
+    template_id: Optional[str] = Query(None, description="Only check against this template"),
+    policy_type: Optional[str] = Query(None),
+    country: Optional[str] = Query(None),
+):
+    """Which mandatory template clauses the contract satisfies and which are missing"""
+    contract = await ContractRepository.get_contract_by_id(contract_id)
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    contract_clauses = await ContractRepository.get_clauses(contract_id)
+    if not contract_clauses:
+        raise HTTPException(status_code=400, detail="No clauses found. Run extraction first.")
+
+    clauses = [
+        {"clause_id": c.clause_id, "text": f"{c.heading or ''}\n{c.text}".strip()}
+        for c in contract_clauses
+    ]
+    return await TemplateMatcher.match(clauses, template_id=template_id, policy_type=policy_type, country=country)
+
+
+@router.get("/{contract_id}/numeric-check", response_model=NumericCheckReport)
+async def numeric_check_endpoint(
+    contract_id: PydanticObjectId,
+    template_id: Optional[str] = Query(None, description="Only check against this template"),
+    policy_type: Optional[str] = Query(None),
+    country: Optional[str] = Query(None),
+):
+    """Amounts, percentages and durations that break the numeric_limits of the matched template clauses"""
+    contract = await ContractRepository.get_contract_by_id(contract_id)
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    contract_clauses = await ContractRepository.get_clauses(contract_id)
+    if not contract_clauses:
+        raise HTTPException(status_code=400, detail="No clauses found. Run extraction first.")
+
+    clauses = [
+        {"clause_id": c.clause_id, "text": f"{c.heading or ''}\n{c.text}".strip()}
+        for c in contract_clauses
+    ]
+    report = await TemplateMatcher.match(clauses, template_id=template_id, policy_type=policy_type, country=country)
+    texts = {c["clause_id"]: c["text"] for c in clauses}
+    checks = [
+        NumericCheck(
+            contract_id=str(contract_id),
+            clause_id=m.contract_clause_id,
+            text=texts[m.contract_clause_id],
+            template_id=m.template_id,
+            template_clause_id=m.template_clause_id,
+            numeric_limits=m.numeric_limits,
+        )
+        for m in report.clause_matches
+        if m.numeric_limits
+    ]
+    return NumericCheckReport(
+        contract_id=str(contract_id),
+        base_currency=settings.NUMERIC_BASE_CURRENCY,
+        checked_clauses=len(checks),
+        violations=validate_numeric_limits(checks),
+    )
+
+
+@router.get("/{contract_id}", response_model=ContractDetail)
+async def get_contract(
+    contract_id: PydanticObjectId,
+    include: Optional[str] = Query(None, description="Comma-separated payloads to load: content, clauses, risks. All by default."),
+):
     """
     Retrieve a contract by its ID.
     """
-    contract = await ContractRepository.get_contract_by_id(contract_id)
+    kinds = None
+    if include is not None:
+        try:
+            kinds = [PayloadKind(k.strip()) for k in include.split(",") if k.strip()]
+        except ValueError:
+            raise HTTPException(status_code=400, detail="include accepts content, clauses and risks")
+    contract = await ContractRepository.get_contract_detail(contract_id, kinds)
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
     return contract
 
 
 
-@router.get("/", response_model=list[ContractDocument])
+@router.get("/", response_model=list[ContractSummary])
 async def list_contracts(
+    response: Response,
     status: Optional[ContractStatus] = Query(None),
-    skip: int = Query(0),
-    limit: int = Query(20),
+    skip: int = Query(0, ge=0, description="Ignored when a cursor is given; prefer cursor for deep pages"),
+    limit: int = Query(20, ge=1, le=1000),
     sort_by: Optional[str] = Query(None),
-    sort_order: Optional[str] = Query("desc")
+    sort_order: Optional[str] = Query("desc"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value of the previous page"),
 ):
-    contracts = await ContractRepository.list_contracts(status, skip, limit, sort_by, sort_order)
+    try:
+        contracts, next_cursor = await ContractRepository.list_contracts(
+            status, skip, limit, sort_by, sort_order, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    response.headers["X-Total-Count"] = str(await ContractRepository.count_contracts(status))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return contracts
 
-@router.put("/{contract_id}/status", response_model=ContractDocument)
+@router.put("/{contract_id}/status", response_model=ContractUpdateResponse, response_model_exclude_none=True)
 async def update_contract_status(
     contract_id: PydanticObjectId,
-    new_status: ContractStatus = Body(...)
+    new_status: ContractStatus = Body(...),
+    expected_version: Optional[int] = Body(None, description="Reject with 409 if the contract is no longer at this version"),
 ):
-    updated = await ContractRepository.update_contract_status(contract_id, new_status)
+    updated = await ContractRepository.update_contract_status(contract_id, new_status, expected_version)
     if not updated:
         raise HTTPException(status_code=404, detail="Contract not found")
     return updated
 
-@router.put("/{contract_id}", response_model=ContractDocument)
+@router.put("/{contract_id}", response_model=ContractUpdateResponse, response_model_exclude_none=True)
 async def update_contract(
     contract_id: PydanticObjectId,
     content: Optional[str] = Body(None),
     name: Optional[str] = Body(None),
-    category: Optional[str] = Body(None)
+    category: Optional[str] = Body(None),
+    expected_version: Optional[int] = Body(None, description="Reject with 409 if the contract is no longer at this version"),
 ):
-    """Update contract content, name, and/or category"""
-    updated = await ContractRepository.update_contract(contract_id, content, name, category)
+    """Update contract content, name, and/or category; returns only the changed fields"""
+    updated = await ContractRepository.update_contract(contract_id, content, name, category, expected_version)
     if not updated:
         raise HTTPException(status_code=404, detail="Contract not found")
     return updated
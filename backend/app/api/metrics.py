@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Query
+from app.services.embedders import CachingEmbedder
+from app.services.embedding import TextDocumentProcessor
+from app.services.llm_limiter import get_llm_limiter
+from app.services.recall_benchmark import run_recall_benchmark
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/llm")
+async def get_llm_metrics():
+    """Queue depth, in-flight calls and wait times of the shared LLM rate limiter."""
+    return get_llm_limiter().metrics()
+
+
+@router.get("/embeddings")
+async def get_embedding_metrics():
+    """Hit and miss counts of the embedding cache."""
+    embedder = TextDocumentProcessor.embedder
+    if not isinstance(embedder, CachingEmbedder):
+        return {"cache_enabled": False}
+    return {
+        "cache_enabled": True,
+        "memory_hits": embedder.hits,
+        "persistent_hits": embedder.persistent_hits,
+        "misses": embedder.misses,
+        "memory_entries": len(embedder._lru),
+    }
+
+
+@router.get("/retrieval-recall")
+async def get_retrieval_recall(sample_size: int = Query(100, ge=1, le=1000), top_k: int = Query(10, ge=1, le=100)):
+    """Recall@k of the configured policy search against exact search, and vector memory estimates."""
+    return await run_recall_benchmark(sample_size=sample_size, top_k=top_k)
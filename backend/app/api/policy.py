@@ -2,7 +2,9 @@ from fastapi import APIRouter, HTTPException
 from typing import List
 from app.models.policy import Template
 from app.dto.policy import TemplateCreateSchema, TemplateUpdateSchema,  TemplateReadSchema
+from app.dto.policy import PolicyBatchSearchRequest, PolicyBatchSearchResponse, PolicySearchResult
 from app.repositories.policy import TemplateRepository
+from app.services.embedding import TextDocumentProcessor
 
 router = APIRouter(prefix="/templates", tags=["Templates"])
 
@@ -12,6 +14,21 @@ async def create_template(template_create: TemplateCreateSchema):
     created = await TemplateRepository.create(template)
     return TemplateReadSchema(**created.dict())
 
+@router.post("/search/batch", response_model=PolicyBatchSearchResponse)
+async def search_policies_batch(request: PolicyBatchSearchRequest):
+    """Top-k policy clauses for each text: batched embeddings and a single Qdrant batch search"""
+    response = await TextDocumentProcessor.retrieve_policies_batch(
+        [item.text for item in request.items],
+        top_k=request.top_k,
+        policy_filter=request.filter,
+    )
+    if not response.success:
+        raise HTTPException(status_code=503, detail=response.message)
+    return PolicyBatchSearchResponse(results=[
+        PolicySearchResult(id=item.id, policies=hits)
+        for item, hits in zip(request.items, response.data)
+    ])
+
 @router.get("/{template_id}", response_model=TemplateReadSchema)
 async def get_template(template_id: str):
     template = await TemplateRepository.get_by_id(template_id)
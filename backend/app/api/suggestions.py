@@ -32,7 +32,7 @@ async def generate_clause_suggestions(request: SuggestionsRequest):
                 detail="Contract content is required"
             )
         
-        result = generate_suggestions(
+        result = await generate_suggestions(
             content=request.content,
             query=request.query
         )
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional
 from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -135,6 +135,23 @@ class Settings(BaseSettings):
     QDRANT_URL:str
     QDRANT_GRPC_PORT:int
     QDRANT_STORAGE_PATH:str="/qdrant/storage"
+    QDRANT_PORT: int = 6333
+    QDRANT_PREFER_GRPC: bool = False
+    QDRANT_TIMEOUT: int = 10
+    QDRANT_COLLECTION: str = "template_clauses_1"  # policy clauses: written by template ingestion, searched by retrieval and agents
+    QDRANT_QUANTIZATION: str = "none"  # "none", "scalar" (int8, ~4x smaller) or "binary" (~32x smaller)
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = True  # keep quantized vectors in RAM when originals are on disk
+    QDRANT_RESCORE: bool = True  # re-rank quantized candidates with the original vectors
+    QDRANT_OVERSAMPLING: float = 2.0  # candidates fetched per result before rescoring
+    QDRANT_VECTORS_ON_DISK: bool = False
+    QDRANT_HNSW_M: int = 16
+    QDRANT_HNSW_EF_CONSTRUCT: int = 100
+    QDRANT_HNSW_EF: int = 128  # search-time beam width
+    QDRANT_HNSW_ON_DISK: bool = False
+    POLICY_RETRIEVAL_MODE: str = "hybrid"  # "hybrid" (dense + BM25, fused with RRF) or "dense"
+    HYBRID_RRF_K: int = 60
+    HYBRID_CANDIDATES_FACTOR: int = 3  # candidates per result fetched from each retriever before fusion
+    SPARSE_FAST_PATH_MAX_TERMS: int = 4  # keyword queries up to this many words skip embedding
     @property
     def allowed_origins_list(self) -> list[str]:
         return [o.strip() for o in self.ALLOWED_ORIGINS.split(",") if o.strip()]
@@ -168,9 +185,51 @@ class Settings(BaseSettings):
     LLM_TEMPERATURE: float = 0.1  
     LLM_MAX_TOKENS: int = 2000
     LLM_TIMEOUT: int = 60
-    EMBEDDING_DIMENSION: int = 384
+    LLM_REQUESTS_PER_MINUTE: int = 30
+    LLM_TOKENS_PER_MINUTE: int = 200000
+    LLM_MAX_CONCURRENT_REQUESTS: int = 8
+    LLM_RATE_LIMIT_BACKOFF: int = 10  # seconds to pause after a 429 without Retry-After
+    COMPLIANCE_CHECK_TIMEOUT: int = 30  # shared deadline (seconds) for all compliance agents
+    COMPLIANCE_FAN_OUT: bool = False  # send each specialist only its clause-type groups
+    COMPLIANCE_MAX_CONCURRENT_AGENTS: int = 6
+    COMPLIANCE_GROUP_MAX_CLAUSES: int = 20
+    COMPLIANCE_AGENT_MAX_RETRIES: int = 2
+    COMPLIANCE_RETRY_BASE_DELAY: float = 1.0
+    COMPLIANCE_RETRY_MAX_DELAY: float = 10.0
+    COMPLIANCE_HEDGE_ENABLED: bool = False  # send a second request when a call outlives the recent p95
+    COMPLIANCE_HEDGE_PERCENTILE: float = 0.95
+    COMPLIANCE_HEDGE_MIN_SAMPLES: int = 20
+    COMPLIANCE_PRE_RETRIEVAL: bool = True  # retrieve policies once and inject them instead of agent knowledge search
+    COMPLIANCE_POLICIES_PER_CLAUSE: int = 3
+    COMPLIANCE_MAX_POLICIES: int = 40  # cap on distinct policies injected into one prompt
+    COMPLIANCE_POLICY_COUNTRY: Optional[str] = None  # only retrieve active policies of this country
+    AGENT_POLICY_SEARCH_TOP_K: int = 5  # results per search_company_policies tool call
+    TEMPLATE_MATCH_THRESHOLD: float = 0.75  # similarity at which a contract clause satisfies a template clause
+    NUMERIC_BASE_CURRENCY: str = "QAR"  # currency of Template numeric_limits amounts
+    CURRENCY_RATES_TO_QAR: Dict[str, float] = {  # value of one unit in QAR, QAR is pegged to USD
+        "QAR": 1.0,
+        "USD": 3.64,
+        "EUR": 3.95,
+        "GBP": 4.60,
+        "SAR": 0.97,
+        "AED": 0.99,
+    }
+    COMPLIANCE_PRESCREEN_ENABLED: bool = False  # skip specialists whose clauses show no local risk signal
+    COMPLIANCE_PRESCREEN_THRESHOLD: float = 0.5
+    COMPLIANCE_PRESCREEN_POLICY_MATCH: float = 0.9  # similarity above which a clause counts as matching an approved policy
+    WEB_SEARCH_BACKEND: str = "duckduckgo"  # "duckduckgo" or "stub" for offline runs
+    WEB_SEARCH_CACHE_PATH: str = "data/web_search_cache.sqlite3"
+    WEB_SEARCH_CACHE_TTL: int = 7 * 24 * 3600
+    WEB_SEARCH_MAX_RESULTS: int = 5
+    WEB_SEARCH_STUB_PATH: Optional[str] = None  # JSON {query: [{title, snippet, url}]} used by the stub backend
+    EMBEDDING_DIMENSION: Optional[int] = None  # None: the embedding model's native size
     MONGO_URI: str = Field(default=...)
     MONGO_DB: str = Field(default=...)
+    CONTRACT_PAYLOAD_INLINE_MAX_BYTES: int = 4 * 1024 * 1024  # larger (compressed) contract payloads go to MinIO
+    CONTRACT_PAYLOAD_COMPRESSION: str = "zstd"  # "zstd" or "none"
+    CONTRACT_PAYLOAD_COMPRESS_MIN_BYTES: int = 16 * 1024  # smaller payloads are stored as plain JSON
+    CONTRACT_PAYLOAD_ZSTD_LEVEL: int = 9
+    MONGO_INDEX_REPORT: bool = True  # log missing/unused indexes and collection-scanning hot queries at startup
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     JWT_ALGORITHM: str = "HS256"
@@ -183,6 +242,14 @@ class Settings(BaseSettings):
     ZR_EXPRESS_KEY: str
     GOOGLE_EMBEDDING_API_KEY:str
     EMBEDDING_MODEL:str="gemini-embedding-001"
+    EMBEDDING_BATCH_SIZE: int = 100  # texts per embedding request (Gemini accepts up to 100)
+    EMBEDDING_CONCURRENCY: int = 4  # embedding requests in flight at once
+    EMBEDDING_BACKEND: str = "gemini"  # "gemini" or "local" (CPU sentence-transformers model)
+    LOCAL_EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    LOCAL_EMBEDDING_ONNX: bool = False  # run the local model with the ONNX runtime backend
+    EMBEDDING_QUEUE_MAX_WAIT_MS: int = 10  # how long the embedding queue waits to fill a batch
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_SIZE: int = 10000  # vectors kept in the in-process LRU
     model_config = SettingsConfigDict(
         case_sensitive=True,
         extra="allow",  
@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import List, Optional
+from beanie import PydanticObjectId
+from pydantic import BaseModel, ConfigDict, Field
+from app.models.documentUploaded import ContractStatus, clause
+
+
+class ContractSummary(BaseModel):
+    """
+    List view of a contract, read with a Mongo projection of the hot record, which
+    only holds the payload sizes. The full contract comes from GET /contract/{id}.
+    """
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PydanticObjectId = Field(alias="_id")
+    file_name: str
+    file_id: str
+    category: Optional[str] = None
+    status: ContractStatus
+    created_at: datetime
+    uploaded_at: Optional[datetime] = None
+    version: int = 1
+    last_updated: Optional[datetime] = None
+    compliance_score: Optional[float] = None
+    clause_count: int = 0
+    risk_count: int = 0
+
+    class Settings:
+        projection = {
+            "_id": 1,
+            "file_name": 1,
+            "file_id": 1,
+            "category": 1,
+            "status": 1,
+            "created_at": 1,
+            "uploaded_at": 1,
+            "version": 1,
+            "last_updated": 1,
+            "compliance_score": 1,
+            "clause_count": 1,
+            "risk_count": 1,
+        }
+
+
+class ContractUpdateResponse(BaseModel):
+    """
+    Result of a partial contract update: the id, the new version and timestamp, and
+    only the fields that were changed. Content is reported by length, not echoed back.
+    """
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PydanticObjectId = Field(alias="_id")
+    version: int
+    last_updated: datetime
+    status: Optional[ContractStatus] = None
+    file_name: Optional[str] = None
+    category: Optional[str] = None
+    content_length: Optional[int] = None
+
+
+class ContractDetail(BaseModel):
+    """A contract's metadata with the payloads that were requested (content, clauses, risks)"""
+    model_config = ConfigDict(populate_by_name=True)
+
+    id: PydanticObjectId = Field(alias="_id")
+    file_name: str
+    file_id: str
+    category: Optional[str] = None
+    status: ContractStatus
+    created_at: datetime
+    uploaded_at: Optional[datetime] = None
+    version: int = 1
+    last_updated: Optional[datetime] = None
+    compliance_score: Optional[float] = None
+    content_length: int = 0
+    clause_count: int = 0
+    risk_count: int = 0
+    content: Optional[str] = None
+    clauses: Optional[List[clause]] = None
+    risks: Optional[List[dict]] = None
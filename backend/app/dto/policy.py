@@ -66,6 +66,89 @@ class ClauseResponse(BaseModel):
     title: str
     text: str
     score: float
+    rank_score: Optional[float] = None  # fused (hybrid) or BM25 score the results are ordered by
     country: str
     policy_type: str
-    version: int
\ No newline at end of file
+    version: int
+
+
+class PolicyFilter(BaseModel):
+    """Payload filter applied inside the Qdrant search; only active templates by default"""
+    country: Optional[str] = None
+    policy_type: Optional[str] = None
+    statuses: List[PoStatus] = Field(default_factory=lambda: [PoStatus.ACTIVE])
+    version: Optional[int] = None
+
+
+class PolicySearchItem(BaseModel):
+    id: Optional[str] = None  # echoed back, e.g. the contract clause id
+    text: str
+
+
+class PolicyBatchSearchRequest(BaseModel):
+    items: List[PolicySearchItem] = Field(min_length=1, max_length=500)
+    top_k: int = Field(default=5, ge=1, le=50)
+    filter: Optional[PolicyFilter] = None
+
+
+class PolicySearchResult(BaseModel):
+    id: Optional[str] = None
+    policies: List[ClauseResponse]
+
+
+class PolicyBatchSearchResponse(BaseModel):
+    results: List[PolicySearchResult]
+
+
+class MissingTemplateClause(BaseModel):
+    clause_id: str
+    title: str
+    best_score: float
+    closest_contract_clause_id: Optional[str] = None
+
+
+class TemplateCoverage(BaseModel):
+    template_id: str
+    template_name: str
+    policy_type: str
+    country: str
+    mandatory_total: int = 0
+    mandatory_satisfied: int = 0
+    coverage: float = 1.0
+    missing: List[MissingTemplateClause] = []
+
+
+class ClauseMatch(BaseModel):
+    contract_clause_id: str
+    template_id: Optional[str] = None  # None when no template clause reaches the threshold
+    template_clause_id: Optional[str] = None
+    template_clause_title: Optional[str] = None
+    score: float
+    numeric_limits: Optional[dict] = None
+
+
+class CoverageReport(BaseModel):
+    threshold: float
+    templates: List[TemplateCoverage]
+    clause_matches: List[ClauseMatch]
+
+
+class NumericLimitViolation(BaseModel):
+    contract_id: str
+    clause_id: str
+    template_id: str
+    template_clause_id: str
+    limit_key: str
+    kind: str  # "money" (base currency), "percent" or "duration" (days)
+    bound: str  # "max" or "min"
+    limit: float
+    observed: float
+    raw: Optional[str] = None  # text the observed value was read from
+    matched_by: str = "keyword"  # "keyword": value nearest the limit's name; "extreme": largest/smallest of its kind
+
+
+class NumericCheckReport(BaseModel):
+    contract_id: str
+    base_currency: str
+    checked_clauses: int
+    violations: List[NumericLimitViolation]
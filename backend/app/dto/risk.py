@@ -11,6 +11,13 @@ ClauseType = Literal[
     "PAYMENT_TERMS",
     "WARRANTY",
     "GOVERNING_LAW",
+    "INTELLECTUAL_PROPERTY",
+    "DATA_PRIVACY",
+    "WARRANTIES",
+    "NON_COMPETE",
+    "ASSIGNMENT",
+    "INSURANCE",
+    "AUDIT_RIGHTS",
     "STANDARD_BOILERPLATE",
     "UNKNOWN"
 ]
@@ -98,6 +98,10 @@ class CouponCodeAlreadyExists(HTTPBaseException):
     code = status.HTTP_409_CONFLICT
     message = "Coupon code already exists"
 
+class VersionConflict(HTTPBaseException):
+    code = status.HTTP_409_CONFLICT
+    message = "The document was modified by another request; reload it and retry"
+
 # ==================== COUPON SPECIFIC ERRORS ====================
 class CouponExpired(HTTPBaseException):
     code = status.HTTP_400_BAD_REQUEST
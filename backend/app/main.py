@@ -4,7 +4,8 @@ from fastapi import FastAPI, HTTPException, Request
 from contextlib import asynccontextmanager
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from qdrant_client import AsyncQdrantClient
+from app.qdrant import close_qdrant_client, get_qdrant_client
+from app.mongo_indexes import log_index_report
 from app.config import get_config, settings
 from pymongo import AsyncMongoClient
 from beanie import init_beanie
@@ -20,7 +21,10 @@ from app.models.policy import Template
 from app.services.embedding import TextDocumentProcessor
 from app.api.contract import router as contract_router
 from app.api.suggestions import router as suggestions_router
-from app.models.documentUploaded import ContractDocument
+from app.api.metrics import router as metrics_router
+from app.models.documentUploaded import ContractDocument, ContractPayload
+from app.models.compliance import ClauseFindingRecord
+from app.models.embedding import EmbeddingCacheEntry
 from app.services.extractor import DocumentExtractor
 from app.services.rule_engine import RuleEngineService
 from agno.os import AgentOS
@@ -34,11 +38,14 @@ mongo_db = mongo_client[settings.MONGO_DB]
 
 
 async def init_mongo():
-    await init_beanie(database=mongo_db, document_models=[ notification,Template,ContractDocument])
+    # init_beanie creates the indexes declared in each model's Settings
+    document_models = [notification, Template, ContractDocument, ContractPayload, ClauseFindingRecord, EmbeddingCacheEntry]
+    await init_beanie(database=mongo_db, document_models=document_models)
+    if settings.MONGO_INDEX_REPORT:
+        await log_index_report(document_models)
 
 async def init_qdrant():
-    client =AsyncQdrantClient(url=settings.QDRANT_URL, port=6333)
-    return client
+    return get_qdrant_client()
 
 async def init_ocr():
     config = get_config()
@@ -56,10 +63,11 @@ async def lifespan(app: FastAPI):
         minio_root_user=settings.MINIO_ROOT_USER,
         minio_root_password=settings.MINIO_ROOT_PASSWORD
     )
-    await TextDocumentProcessor.init(client)
+    await TextDocumentProcessor.init(client, settings.QDRANT_COLLECTION)
     document_extract =await init_ocr()
     app.state.document_extract = document_extract
     yield
+    await close_qdrant_client()
     
 
 
@@ -85,7 +93,7 @@ app.add_middleware(
         "Access-Control-Allow-Headers",
         "Access-Control-Allow-Methods",
     ],
-    expose_headers=["Content-Type", "Content-Length", "X-Total-Count"],
+    expose_headers=["Content-Type", "Content-Length", "X-Total-Count", "X-Next-Cursor"],
 )
 # app.add_middleware(HTTPSRedirectMiddleware)
 
@@ -136,4 +144,5 @@ app.include_router(contract_router)
 app.include_router(analytics_router)
 app.include_router(policy_router)
 app.include_router(suggestions_router)
+app.include_router(metrics_router)
 
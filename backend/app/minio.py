@@ -1,4 +1,5 @@
 from datetime import timedelta
+import io
 import random
 import string
 import uuid
@@ -74,6 +75,18 @@ class Bucket:
         )
         return object_name
 
+    async def put_bytes(
+        self, data: bytes, object_name: str, content_type: str = "application/octet-stream"
+    ) -> str:
+        await self.client.put_object(
+            bucket_name=self.bucket_name,
+            object_name=f"{self.file_prefix}/{object_name}",
+            data=io.BytesIO(data),
+            length=len(data),
+            content_type=content_type,
+        )
+        return object_name
+
     async def get(self, object_name: str) -> tuple[bytes, str, str]:
         try:
             res = await self.client.get_object(
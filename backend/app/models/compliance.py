@@ -0,0 +1,37 @@
+from datetime import datetime
+from typing import Optional
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class ClauseFindingRecord(Document):
+    """
+    Findings of one specialist agent for one clause of one contract, keyed by the
+    clause text hash and the version of the policy collection it was checked against.
+    Records are never shared between contracts: the score of a clause is the score of
+    the group it was checked in, which depends on the rest of that contract.
+    Contract-level findings (e.g. missing clauses) use clause_hash "contract:<contract_id>".
+    """
+    contract_id: Optional[str] = None
+    clause_hash: str
+    policy_version: str
+    source: str
+    clause_id: str
+    findings: list[dict] = []
+    # None when the agent was not asked about this clause (fan-out routed it elsewhere)
+    compliance_score: Optional[float] = None
+    # Set when the pre-screen skipped the agent: a skip decision, not a verdict
+    prescreened: bool = False
+    prescreen_threshold: Optional[float] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "clause_findings"
+        indexes = [
+            IndexModel(
+                [("contract_id", ASCENDING), ("clause_hash", ASCENDING), ("policy_version", ASCENDING), ("source", ASCENDING)],
+                name="contract_clause_hash_policy_source_unique",
+                unique=True,
+            ),
+        ]
@@ -1,8 +1,9 @@
 from datetime import datetime
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 from beanie import Document, PydanticObjectId
 from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class ContractStatus(str, Enum):
@@ -30,24 +31,77 @@ class Risk(BaseModel):
 
 
 class ContractDocument(Document):
+    """
+    Hot metadata record of a contract. The extracted text, clauses and risk findings
+    live in contract_payloads (ContractPayload) and are loaded on demand; only their
+    sizes are kept here.
+    """
     file_name: str
     file_id: str
     category: Optional[str] = None
-    clauses: Optional[list[clause]] = None
-    content: Optional[str] = None
     status: ContractStatus = ContractStatus.DRAFT
     created_at: datetime = Field(default_factory=datetime.utcnow)
     uploaded_at: datetime = Field(default_factory=datetime.utcnow)
     version: int = 1
     last_updated: datetime = Field(default_factory=datetime.utcnow)
-    risks: Optional[list[dict]] = None
     compliance_score: Optional[float] = None
+    content_length: int = 0
+    clause_count: int = 0
+    risk_count: int = 0
     
     class Settings:
         name = "contracts"
+        # Keyset pagination: one (sort field, _id) index per sortable field, read in either direction
+        indexes = [
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+            IndexModel([("last_updated", DESCENDING), ("_id", DESCENDING)], name="last_updated_id"),
+            IndexModel([("file_name", ASCENDING), ("_id", ASCENDING)], name="file_name_id"),
+            IndexModel([("status", ASCENDING), ("_id", ASCENDING)], name="status_id"),
+            IndexModel(
+                [("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="status_created_at_id",
+            ),
+            IndexModel(
+                [("status", ASCENDING), ("last_updated", DESCENDING), ("_id", DESCENDING)],
+                name="status_last_updated_id",
+            ),
+            IndexModel(
+                [("status", ASCENDING), ("file_name", ASCENDING), ("_id", ASCENDING)],
+                name="status_file_name_id",
+            ),
+        ]
         
     class Config:
         json_encoders = {
             datetime: lambda v: v.isoformat()
         }
-        populate_by_name = True
\ No newline at end of file
+        populate_by_name = True
+
+
+class PayloadKind(str, Enum):
+    CONTENT = "content"
+    CLAUSES = "clauses"
+    RISKS = "risks"
+
+
+class ContractPayload(Document):
+    """
+    One large part of a contract (its text, clauses or findings). Stored inline in
+    `data`, zstd-compressed in `compressed` once it is large enough, or, above
+    CONTRACT_PAYLOAD_INLINE_MAX_BYTES, as an object in MinIO referenced by `blob`,
+    so no contract is bound by Mongo's document size limit.
+    """
+    contract_id: PydanticObjectId
+    kind: PayloadKind
+    data: Optional[Any] = None
+    compressed: Optional[bytes] = None
+    codec: Optional[str] = None  # "zstd" for compressed and blob payloads, None for plain JSON
+    blob: Optional[str] = None
+    size_bytes: int = 0
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "contract_payloads"
+        indexes = [
+            IndexModel([("contract_id", ASCENDING), ("kind", ASCENDING)], name="contract_kind_unique", unique=True),
+        ]
@@ -0,0 +1,22 @@
+from datetime import datetime
+from beanie import Document
+from pydantic import Field
+from pymongo import ASCENDING, IndexModel
+
+
+class EmbeddingCacheEntry(Document):
+    """
+    Persisted embedding of one text. key is a hash of the model and the normalised
+    text; the vector is stored as packed float32 bytes (4 bytes per dimension).
+    """
+    key: str
+    model: str
+    dimension: int
+    vector: bytes
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "embedding_cache"
+        indexes = [
+            IndexModel([("key", ASCENDING)], name="key_unique", unique=True),
+        ]
@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import Optional
 from beanie import Document, Link
+from pymongo import ASCENDING, DESCENDING, IndexModel
 # from app.models.user import User
 
 
@@ -10,4 +11,9 @@ class notification (Document):
     created_at : datetime
     
     class Settings:
-        name = "notifications"
\ No newline at end of file
+        name = "notifications"
+        indexes = [
+            # unsent notifications, newest first
+            IndexModel([("issent", ASCENDING), ("created_at", DESCENDING)], name="issent_created_at"),
+            IndexModel([("created_at", DESCENDING)], name="created_at"),
+        ]
\ No newline at end of file
@@ -5,6 +5,7 @@ import uuid
 
 from beanie import Document, PydanticObjectId
 from pydantic import BaseModel, Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 class PoStatus(str, Enum):
     DRAFT = "draft"
@@ -36,4 +37,14 @@ class Template(Document):
     status: PoStatus = PoStatus.DRAFT
 
     class Settings:
-        name = "templates"                                                                                           
\ No newline at end of file
+        name = "templates"
+        indexes = [
+            # get_by_country_and_type, list_templates (country / country + policy_type)
+            IndexModel(
+                [("country", ASCENDING), ("policy_type", ASCENDING), ("status", ASCENDING)],
+                name="country_policy_type_status",
+            ),
+            IndexModel([("policy_type", ASCENDING), ("status", ASCENDING)], name="policy_type_status"),
+            # active templates for the template matcher
+            IndexModel([("status", ASCENDING), ("updated_at", DESCENDING)], name="status_updated_at"),
+        ]                                                                                           
\ No newline at end of file
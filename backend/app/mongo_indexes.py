@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Optional, Tuple, Type
+from beanie import Document
+from app.models.documentUploaded import ContractDocument
+from app.models.notification import notification
+from app.models.policy import Template
+
+
+# Queries served on hot paths: (model, filter, sort). Each should be an index scan.
+HOT_QUERIES: List[Tuple[Type[Document], Dict[str, Any], List[Tuple[str, int]]]] = [
+    (ContractDocument, {}, [("created_at", -1), ("_id", -1)]),
+    (ContractDocument, {"status": "draft"}, [("created_at", -1), ("_id", -1)]),
+    (ContractDocument, {"status": "draft"}, [("last_updated", -1), ("_id", -1)]),
+    (ContractDocument, {"status": "draft"}, [("file_name", 1), ("_id", 1)]),
+    (Template, {"country": "QA", "policy_type": "general", "status": "active"}, []),
+    (Template, {"policy_type": "general"}, []),
+    (Template, {"status": "active"}, []),
+    (notification, {"issent": False}, [("created_at", -1)]),
+    (notification, {}, [("created_at", -1)]),
+]
+
+
+def _plan_stages(plan: Optional[Dict[str, Any]]) -> List[str]:
+    """All stage names of an explain() winning plan, outermost first"""
+    if not plan:
+        return []
+    stages = [plan.get("stage", "")]
+    for key in ("inputStage", "queryPlan"):
+        stages += _plan_stages(plan.get(key))
+    for child in plan.get("inputStages", []):
+        stages += _plan_stages(child)
+    return stages
+
+
+async def index_report(models: List[Type[Document]]) -> Dict[str, Any]:
+    """
+    Declared indexes missing from the server, indexes never used since the server
+    started ($indexStats), and hot queries whose winning plan is a collection scan.
+    """
+    report: Dict[str, Any] = {"missing": {}, "unused": {}, "collection_scans": []}
+    for model in models:
+        collection = model.get_pymongo_collection()
+        name = collection.name
+        existing = await collection.index_information()
+        declared = [getattr(index, "document", {}).get("name") for index in getattr(model.Settings, "indexes", [])]
+        missing = [index for index in declared if index and index not in existing]
+        if missing:
+            report["missing"][name] = missing
+
+        cursor = await collection.aggregate([{"$indexStats": {}}])
+        stats = await cursor.to_list()
+        unused = [s["name"] for s in stats if s["name"] != "_id_" and s.get("accesses", {}).get("ops", 0) == 0]
+        if unused:
+            report["unused"][name] = sorted(unused)
+
+    for model, query, sort in HOT_QUERIES:
+        if model not in models:
+            continue
+        find = model.get_pymongo_collection().find(query)
+        if sort:
+            find = find.sort(sort)
+        explain = await find.limit(1).explain()
+        stages = _plan_stages(explain.get("queryPlanner", {}).get("winningPlan"))
+        if "COLLSCAN" in stages:
+            report["collection_scans"].append({
+                "collection": model.get_pymongo_collection().name,
+                "filter": list(query),
+                "sort": [field for field, _ in sort],
+            })
+    return report
+
+
+async def log_index_report(models: List[Type[Document]]) -> None:
+    try:
+        report = await index_report(models)
+    except Exception as e:
+        print(f"[WARNING] Mongo index report failed: {e}")
+        return
+
+    for collection, names in report["missing"].items():
+        print(f"[WARNING] Declared indexes missing on '{collection}': {', '.join(names)}")
+    for scan in report["collection_scans"]:
+        print(f"[WARNING] Collection scan on '{scan['collection']}' for filter {scan['filter']} sort {scan['sort']}")
+    for collection, names in report["unused"].items():
+        print(f"[DEBUG] Indexes unused since server start on '{collection}': {', '.join(names)}")
+    if not report["missing"] and not report["collection_scans"]:
+        print("[DEBUG] Mongo indexes: all declared indexes present, hot queries use index scans")
@@ -0,0 +1,30 @@
+from typing import Optional
+from qdrant_client import AsyncQdrantClient
+from app.config import settings
+
+
+_client: Optional[AsyncQdrantClient] = None
+
+
+def get_qdrant_client() -> AsyncQdrantClient:
+    """
+    The process-wide Qdrant client. Template ingestion, policy retrieval and the
+    agents' policy search all go through it and share its connection pool.
+    """
+    global _client
+    if _client is None:
+        _client = AsyncQdrantClient(
+            url=settings.QDRANT_URL,
+            port=settings.QDRANT_PORT,
+            grpc_port=settings.QDRANT_GRPC_PORT,
+            prefer_grpc=settings.QDRANT_PREFER_GRPC,
+            timeout=settings.QDRANT_TIMEOUT,
+        )
+    return _client
+
+
+async def close_qdrant_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
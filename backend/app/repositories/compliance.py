@@ -0,0 +1,43 @@
+from typing import List
+from pymongo import ReplaceOne
+from pymongo.errors import BulkWriteError
+from app.models.compliance import ClauseFindingRecord
+
+
+class ComplianceFindingRepository:
+
+    @staticmethod
+    async def get_for_hashes(contract_id: str, clause_hashes: List[str], policy_version: str) -> List[ClauseFindingRecord]:
+        if not clause_hashes:
+            return []
+        return await ClauseFindingRecord.find({
+            "contract_id": contract_id,
+            "clause_hash": {"$in": clause_hashes},
+            "policy_version": policy_version,
+        }).to_list()
+
+    @staticmethod
+    async def save_many(contract_id: str, policy_version: str, records: List[ClauseFindingRecord]) -> None:
+        """
+        Upsert records on (contract_id, clause_hash, policy_version, source) and drop the
+        contract's records for other policy versions, which are never read again.
+        """
+        collection = ClauseFindingRecord.get_pymongo_collection()
+        if records:
+            try:
+                await collection.bulk_write(
+                    [
+                        ReplaceOne(
+                            {"contract_id": r.contract_id, "clause_hash": r.clause_hash, "policy_version": r.policy_version, "source": r.source},
+                            r.model_dump(exclude={"id", "revision_id"}),
+                            upsert=True,
+                        )
+                        for r in records
+                    ],
+                    ordered=False,
+                )
+            except BulkWriteError as e:
+                # A concurrent check upserted the same key first; its record is as good as ours
+                if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                    raise
+        await collection.delete_many({"contract_id": contract_id, "policy_version": {"$ne": policy_version}})
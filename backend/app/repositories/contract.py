@@ -1,87 +1,279 @@
-from typing import List, Optional
+import base64
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 from beanie import PydanticObjectId
-from app.models.documentUploaded import ContractDocument, ContractStatus
+from pymongo import ReturnDocument
+from app.models.documentUploaded import ContractDocument, ContractPayload, ContractStatus, PayloadKind, clause
+from app.dto.contract import ContractDetail, ContractSummary, ContractUpdateResponse
+from app.exceptions import VersionConflict
+from app.repositories.contract_payload import ContractPayloadRepository
+
+
+SORTABLE_FIELDS = ["created_at", "last_updated", "file_name", "status"]
+
+
+def _size_fields(kind: PayloadKind, data: Any) -> Dict[str, int]:
+    """Counters kept on the hot record for a payload"""
+    if kind == PayloadKind.CONTENT:
+        return {"content_length": len(data or "")}
+    if kind == PayloadKind.CLAUSES:
+        return {"clause_count": len(data or [])}
+    return {"risk_count": len(data or [])}
+
+
+def _encode_cursor(sort_field: str, sort_order: str, value: Any, contract_id: PydanticObjectId) -> str:
+    """Opaque page token: the sort key and _id of the last contract on the page"""
+    if isinstance(value, datetime):
+        encoded = {"t": "dt", "v": value.isoformat()}
+    else:
+        encoded = {"t": "str", "v": getattr(value, "value", value)}
+    raw = json.dumps({"s": sort_field, "o": sort_order, "id": str(contract_id), **encoded})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_field: str, sort_order: str) -> Tuple[Any, PydanticObjectId]:
+    """(sort value, _id) from a page token; ValueError if it is malformed or from another sort"""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        value = datetime.fromisoformat(data["v"]) if data["t"] == "dt" else data["v"]
+        contract_id = PydanticObjectId(data["id"])
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+    if data.get("s") != sort_field or data.get("o") != sort_order:
+        raise ValueError("Cursor does not match the requested sort")
+    return value, contract_id
 
 
 class ContractRepository:
 
     @staticmethod
-    async def create_contract(file_name: str, file_id: str, content: Optional[str] = None) -> ContractDocument:
+    async def create_contract(
+        file_name: str,
+        file_id: str,
+        content: Optional[str] = None,
+        category: Optional[str] = None,
+    ) -> ContractDocument:
         contract = ContractDocument(
             file_name=file_name,
             file_id=file_id,
-            content=content,
-            status=ContractStatus.DRAFT
+            category=category,
+            status=ContractStatus.DRAFT,
+            content_length=len(content or ""),
         )
         await contract.insert()
+        if content is not None:
+            await ContractPayloadRepository.save(contract.id, PayloadKind.CONTENT, content)
         return contract
 
     @staticmethod
     async def get_contract_by_id(contract_id: PydanticObjectId) -> Optional[ContractDocument]:
+        """The hot metadata record only; payloads are read with get_payloads"""
         return await ContractDocument.get(contract_id)
 
+    @staticmethod
+    async def migrate_inline_payloads(contract_id: PydanticObjectId) -> Dict[PayloadKind, Any]:
+        """
+        Move content/clauses/risks still stored inline on a contracts record (older layout)
+        into contract_payloads, and unset them there. A kind that already has a payload
+        keeps it: the inline copy is older and is only dropped. Returns the moved payloads.
+        """
+        collection = ContractDocument.get_pymongo_collection()
+        raw = await collection.find_one({"_id": contract_id}, projection={k.value: 1 for k in PayloadKind})
+        if not raw or len(raw) == 1:
+            return {}
+
+        inline = {k: raw[k.value] for k in PayloadKind if raw.get(k.value) is not None}
+        existing = await ContractPayload.get_pymongo_collection().distinct(
+            "kind", {"contract_id": contract_id, "kind": {"$in": [k.value for k in inline]}}
+        )
+        moved: Dict[PayloadKind, Any] = {}
+        sizes: Dict[str, int] = {}
+        for kind, data in inline.items():
+            if kind.value in existing:
+                continue
+            # Insert-only: a payload written meanwhile by set_payload/update_contract wins
+            if await ContractPayloadRepository.save(contract_id, kind, data, only_if_absent=True) is not None:
+                moved[kind] = data
+                sizes.update(_size_fields(kind, data))
+        update: Dict[str, Any] = {"$unset": {k.value: "" for k in raw if k != "_id"}}
+        if sizes:
+            update["$set"] = sizes
+        await collection.update_one({"_id": contract_id}, update)
+        return moved
+
+    @staticmethod
+    async def get_payloads(contract_id: PydanticObjectId, kinds: Iterable[PayloadKind]) -> Dict[PayloadKind, Any]:
+        kinds = list(kinds)
+        payloads = await ContractPayloadRepository.get_many(contract_id, kinds)
+        if len(payloads) < len(kinds):
+            legacy = await ContractRepository.migrate_inline_payloads(contract_id)
+            for kind in kinds:
+                if kind not in payloads and kind in legacy:
+                    payloads[kind] = legacy[kind]
+        return payloads
+
+    @staticmethod
+    async def get_content(contract_id: PydanticObjectId) -> Optional[str]:
+        return (await ContractRepository.get_payloads(contract_id, [PayloadKind.CONTENT])).get(PayloadKind.CONTENT)
+
+    @staticmethod
+    async def get_clauses(contract_id: PydanticObjectId) -> List[clause]:
+        data = (await ContractRepository.get_payloads(contract_id, [PayloadKind.CLAUSES])).get(PayloadKind.CLAUSES)
+        return [clause.model_validate(c) for c in data or []]
+
+    @staticmethod
+    async def set_payload(
+        contract_id: PydanticObjectId,
+        kind: PayloadKind,
+        data: Any,
+        fields: Optional[dict] = None,
+    ) -> None:
+        """
+        Replace one payload and update its counter, plus any other `fields`, on the hot
+        record. A stale inline copy of the kind (older layout) is dropped at the same time.
+        """
+        await ContractPayloadRepository.save(contract_id, kind, data)
+        await ContractDocument.get_pymongo_collection().update_one(
+            {"_id": contract_id},
+            {"$set": {**_size_fields(kind, data), **(fields or {})}, "$unset": {kind.value: ""}},
+        )
+
+    @staticmethod
+    async def get_contract_detail(
+        contract_id: PydanticObjectId,
+        include: Optional[Iterable[PayloadKind]] = None,
+    ) -> Optional[ContractDetail]:
+        """Metadata plus the requested payloads (all of them by default)"""
+        contract = await ContractDocument.get(contract_id)
+        if not contract:
+            return None
+        kinds = list(PayloadKind) if include is None else list(include)
+        payloads = await ContractRepository.get_payloads(contract_id, kinds) if kinds else {}
+        return ContractDetail(
+            **contract.model_dump(),
+            **{kind.value: data for kind, data in payloads.items()},
+        )
+
     @staticmethod
     async def list_contracts(
         status: Optional[ContractStatus] = None, 
         skip: int = 0, 
         limit: int = 20,
         sort_by: Optional[str] = None,
-        sort_order: Optional[str] = "desc"
-    ) -> List[ContractDocument]:
+        sort_order: Optional[str] = "desc",
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[ContractSummary], Optional[str]]:
+        """
+        One page of contract summaries and the cursor of the next page (None on the last one).
+        Pages are read by keyset on (sort field, _id) through the matching compound index,
+        so a deep page costs the same as the first. `skip` is only applied without a cursor.
+        """
         query = {}
         if status:
             query["status"] = status
-        
-        # Build the query
-        find_query = ContractDocument.find(query)
-        
-        # Apply sorting if sort_by is provided
-        if sort_by:
-            # Map frontend sort field names to database field names
-            sort_field = sort_by if sort_by in ["created_at", "last_updated", "file_name", "status"] else "created_at"
-            sort_direction = -1 if sort_order == "desc" else 1
-            find_query = find_query.sort((sort_field, sort_direction))
-        else:
-            # Default sort by created_at descending
-            find_query = find_query.sort(("created_at", -1))
-        
-        return await find_query.skip(skip).limit(limit).to_list()
+
+        # Map frontend sort field names to database field names
+        sort_field = sort_by if sort_by in SORTABLE_FIELDS else "created_at"
+        sort_order = "asc" if sort_order == "asc" else "desc"
+        sort_direction = -1 if sort_order == "desc" else 1
+
+        if cursor:
+            value, last_id = _decode_cursor(cursor, sort_field, sort_order)
+            op = "$lt" if sort_direction == -1 else "$gt"
+            query["$or"] = [
+                {sort_field: {op: value}},
+                {sort_field: value, "_id": {op: last_id}},
+            ]
+
+        # _id breaks ties so rows with equal sort values are neither repeated nor skipped
+        find_query = ContractDocument.find(query).sort((sort_field, sort_direction), ("_id", sort_direction))
+        if not cursor and skip:
+            find_query = find_query.skip(skip)
+        # One extra row tells whether another page follows
+        rows = await find_query.limit(limit + 1).project(ContractSummary).to_list()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = _encode_cursor(sort_field, sort_order, getattr(last, sort_field), last.id)
+        return rows, next_cursor
 
     @staticmethod
-    async def update_contract_status(contract_id: PydanticObjectId, new_status: ContractStatus) -> Optional[ContractDocument]:
-        contract = await ContractDocument.get(contract_id)
-        if not contract:
+    async def count_contracts(status: Optional[ContractStatus] = None) -> int:
+        """Total for X-Total-Count: collection metadata count, or an index-only count per status"""
+        collection = ContractDocument.get_pymongo_collection()
+        if status:
+            return await collection.count_documents({"status": status.value})
+        return await collection.estimated_document_count()
+
+    @staticmethod
+    async def _apply_update(
+        contract_id: PydanticObjectId,
+        changes: dict,
+        expected_version: Optional[int] = None,
+    ) -> Optional[ContractUpdateResponse]:
+        """
+        Set `changes` and bump the version in one find_one_and_update, reading back only
+        the changed fields. With expected_version the write only applies if nobody else
+        updated the contract since that version; otherwise VersionConflict is raised.
+        """
+        query = {"_id": contract_id}
+        if expected_version is not None:
+            query["version"] = expected_version
+
+        changes = {**changes, "last_updated": datetime.utcnow()}
+        projection = {"_id": 1, "version": 1, **{field: 1 for field in changes}}
+
+        updated = await ContractDocument.get_pymongo_collection().find_one_and_update(
+            query,
+            {"$set": changes, "$inc": {"version": 1}},  # Auto-increment version on every update
+            projection=projection,
+            return_document=ReturnDocument.AFTER,
+        )
+        if updated is None:
+            if expected_version is not None and await ContractDocument.find_one({"_id": contract_id}).count():
+                raise VersionConflict(extra_details={"expected_version": expected_version})
             return None
-        contract.status = new_status
-        contract.version += 1  # Auto-increment version on every update
-        contract.last_updated = datetime.utcnow()
-        await contract.save()
-        return contract
+        return ContractUpdateResponse.model_validate(updated)
+
+    @staticmethod
+    async def update_contract_status(
+        contract_id: PydanticObjectId,
+        new_status: ContractStatus,
+        expected_version: Optional[int] = None,
+    ) -> Optional[ContractUpdateResponse]:
+        return await ContractRepository._apply_update(
+            contract_id, {"status": new_status.value}, expected_version
+        )
 
     @staticmethod
     async def update_contract(
         contract_id: PydanticObjectId,
         content: Optional[str] = None,
         name: Optional[str] = None,
-        category: Optional[str] = None
-    ) -> Optional[ContractDocument]:
-        contract = await ContractDocument.get(contract_id)
-        if not contract:
-            return None
-        
+        category: Optional[str] = None,
+        expected_version: Optional[int] = None,
+    ) -> Optional[ContractUpdateResponse]:
         # Update fields if provided
+        changes = {}
         if content is not None:
-            contract.content = content
+            changes["content_length"] = len(content)
         if name is not None:
-            contract.file_name = name
+            changes["file_name"] = name
         if category is not None:
-            contract.category = category
-        
-        contract.version += 1
-        contract.last_updated = datetime.utcnow()
-        await contract.save()
-        return contract
+            changes["category"] = category
+        # The version check runs on the hot record first, so a rejected update writes no payload
+        updated = await ContractRepository._apply_update(contract_id, changes, expected_version)
+        if updated and content is not None:
+            await ContractPayloadRepository.save(contract_id, PayloadKind.CONTENT, content)
+            # Drop a stale inline copy (older layout) so it can never be migrated over the new text
+            await ContractDocument.get_pymongo_collection().update_one(
+                {"_id": contract_id, "content": {"$exists": True}},
+                {"$unset": {"content": ""}},
+            )
+        return updated
 
     @staticmethod
     async def delete_contract(contract_id: PydanticObjectId) -> bool:
@@ -89,4 +281,5 @@ class ContractRepository:
         if not contract:
             return False
         await contract.delete()
+        await ContractPayloadRepository.delete_all(contract_id)
         return True
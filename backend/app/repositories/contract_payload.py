@@ -0,0 +1,148 @@
+import asyncio
+import gzip
+import json
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+import zstandard
+from beanie import PydanticObjectId
+from pymongo import ReturnDocument
+from app.config import settings
+from app.minio import DocumentBucket
+from app.models.documentUploaded import ContractPayload, PayloadKind
+
+
+def _payload_bucket() -> DocumentBucket:
+    return DocumentBucket(file_prefix="contract-payloads")
+
+
+def _compress(encoded: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=settings.CONTRACT_PAYLOAD_ZSTD_LEVEL).compress(encoded)
+
+
+def _decompress(data: bytes, codec: Optional[str]) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    return data
+
+
+class ContractPayloadRepository:
+    """
+    Large contract parts (text, clauses, findings), one ContractPayload per (contract, kind).
+    Payloads above CONTRACT_PAYLOAD_COMPRESS_MIN_BYTES are stored zstd-compressed and
+    decompressed transparently on read.
+    """
+
+    @staticmethod
+    async def save(
+        contract_id: PydanticObjectId,
+        kind: PayloadKind,
+        data: Any,
+        only_if_absent: bool = False,
+    ) -> Optional[int]:
+        """
+        Store a payload inline or, when too large for inline storage, as a blob in MinIO;
+        returns its size in bytes. With only_if_absent an existing payload of that kind is
+        kept as is and None is returned.
+        """
+        encoded = json.dumps(data, default=str).encode("utf-8")
+        fields: Dict[str, Any] = {"size_bytes": len(encoded), "updated_at": datetime.utcnow()}
+
+        compress = settings.CONTRACT_PAYLOAD_COMPRESSION == "zstd" and len(encoded) >= settings.CONTRACT_PAYLOAD_COMPRESS_MIN_BYTES
+        # Compressing a few MB takes long enough to stall the event loop
+        stored = await asyncio.to_thread(_compress, encoded) if compress else encoded
+        codec = "zstd" if compress else None
+
+        if len(stored) > settings.CONTRACT_PAYLOAD_INLINE_MAX_BYTES:
+            # Unique per write, so a write that loses never clobbers the blob of the one that won
+            object_name = f"{contract_id}/{kind.value}-{uuid.uuid4().hex}.json" + (".zst" if compress else "")
+            await _payload_bucket().put_bytes(stored, object_name)
+            fields.update({"data": None, "compressed": None, "blob": object_name, "codec": codec})
+        elif compress:
+            fields.update({"data": None, "compressed": stored, "blob": None, "codec": codec})
+        else:
+            fields.update({"data": data, "compressed": None, "blob": None, "codec": None})
+
+        collection = ContractPayload.get_pymongo_collection()
+        if only_if_absent:
+            result = await collection.update_one(
+                {"contract_id": contract_id, "kind": kind.value},
+                {"$setOnInsert": fields},
+                upsert=True,
+            )
+            if result.upserted_id is None:
+                if fields["blob"]:
+                    await ContractPayloadRepository._delete_blob(fields["blob"])
+                return None
+            return len(encoded)
+
+        previous = await collection.find_one_and_update(
+            {"contract_id": contract_id, "kind": kind.value},
+            {"$set": fields},
+            projection={"blob": 1},
+            upsert=True,
+            return_document=ReturnDocument.BEFORE,
+        )
+        stale_blob = (previous or {}).get("blob")
+        if stale_blob and stale_blob != fields["blob"]:
+            await ContractPayloadRepository._delete_blob(stale_blob)
+        return len(encoded)
+
+    @staticmethod
+    async def _read(document: Dict[str, Any]) -> Any:
+        codec = document.get("codec")
+        if document.get("blob"):
+            data, _, _ = await _payload_bucket().get(document["blob"])
+            # Blobs written before compression was configurable are gzip
+            if codec is None and document["blob"].endswith(".gz"):
+                codec = "gzip"
+        elif document.get("compressed") is not None:
+            data = document["compressed"]
+        else:
+            return document.get("data")
+        return json.loads(await asyncio.to_thread(_decompress, bytes(data), codec))
+
+    @staticmethod
+    async def get_many(contract_id: PydanticObjectId, kinds: Iterable[PayloadKind]) -> Dict[PayloadKind, Any]:
+        """Payloads of the requested kinds that exist for the contract, in one query"""
+        cursor = ContractPayload.get_pymongo_collection().find(
+            {"contract_id": contract_id, "kind": {"$in": [k.value for k in kinds]}},
+            projection={"kind": 1, "data": 1, "compressed": 1, "codec": 1, "blob": 1},
+        )
+        return {
+            PayloadKind(document["kind"]): await ContractPayloadRepository._read(document)
+            async for document in cursor
+        }
+
+    @staticmethod
+    async def get(contract_id: PydanticObjectId, kind: PayloadKind) -> Optional[Any]:
+        return (await ContractPayloadRepository.get_many(contract_id, [kind])).get(kind)
+
+    @staticmethod
+    async def _delete_blob(object_name: str) -> None:
+        try:
+            await _payload_bucket().delete(object_name)
+        except Exception as e:
+            print(f"[WARNING] Could not delete payload blob {object_name}: {e}")
+
+    @staticmethod
+    async def delete_all(contract_id: PydanticObjectId) -> None:
+        collection = ContractPayload.get_pymongo_collection()
+        async for document in collection.find({"contract_id": contract_id, "blob": {"$ne": None}}, projection={"blob": 1}):
+            await ContractPayloadRepository._delete_blob(document["blob"])
+        await collection.delete_many({"contract_id": contract_id})
+
+    @staticmethod
+    async def recompress(document: Dict[str, Any]) -> bool:
+        """Rewrite one stored payload with the current compression settings; False if already up to date"""
+        wants_zstd = (
+            settings.CONTRACT_PAYLOAD_COMPRESSION == "zstd"
+            and document.get("size_bytes", 0) >= settings.CONTRACT_PAYLOAD_COMPRESS_MIN_BYTES
+        )
+        if wants_zstd == (document.get("codec") == "zstd"):
+            return False
+        data = await ContractPayloadRepository._read(document)
+        await ContractPayloadRepository.save(document["contract_id"], PayloadKind(document["kind"]), data)
+        return True
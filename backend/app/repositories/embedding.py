@@ -0,0 +1,24 @@
+from typing import Dict, List
+from pymongo.errors import BulkWriteError
+from app.models.embedding import EmbeddingCacheEntry
+
+
+class EmbeddingCacheRepository:
+
+    @staticmethod
+    async def get_many(keys: List[str]) -> Dict[str, EmbeddingCacheEntry]:
+        if not keys:
+            return {}
+        entries = await EmbeddingCacheEntry.find({"key": {"$in": keys}}).to_list()
+        return {entry.key: entry for entry in entries}
+
+    @staticmethod
+    async def save_many(entries: List[EmbeddingCacheEntry]) -> None:
+        """Insert new entries; keys cached concurrently by another request are left as they are"""
+        if not entries:
+            return
+        try:
+            await EmbeddingCacheEntry.insert_many(entries, ordered=False)
+        except BulkWriteError as e:
+            if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+                raise
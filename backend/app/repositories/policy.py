@@ -1,11 +1,19 @@
+import hashlib
 from typing import List, Optional
 from beanie import PydanticObjectId
 from datetime import datetime
+from pydantic import BaseModel, Field
 from app.models.policy import Template,  PoStatus  ,Clause
 from app.dto.policy import TemplateCreateSchema, TemplateUpdateSchema
 from app.services.embedding import ResponseSchema, TextDocumentProcessor
 
 
+class TemplateVersionView(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")
+    version: int
+    status: PoStatus
+
+
 class TemplateRepository:
 
     @staticmethod
@@ -30,6 +38,17 @@ class TemplateRepository:
             (Template.country == country) & (Template.policy_type == policy_type) & (Template.status == PoStatus.ACTIVE)
         )
 
+    @staticmethod
+    async def get_policy_version(collection_name: str) -> str:
+        """
+        Fingerprint of the policy collection: changes whenever a template is
+        created, updated or has its status changed.
+        """
+        views = await Template.find({}).project(TemplateVersionView).to_list()
+        entries = sorted(f"{v.id}:{v.version}:{v.status.value}" for v in views)
+        digest = hashlib.sha256("\n".join([collection_name, *entries]).encode("utf-8"))
+        return digest.hexdigest()[:16]
+
     @staticmethod
     async def list_templates(country: Optional[str] = None, policy_type: Optional[str] = None) -> List[Template]:
         query = Template.find({})
@@ -49,6 +68,11 @@ class TemplateRepository:
             template.version += 1
             update_dict['version'] = template.version
             await template.update({"$set": update_dict})
+            template = await Template.get(template_id)
+            # Re-index changed clauses and refresh version/status on the others
+            embed_result: ResponseSchema = await TextDocumentProcessor.embed_template(template)
+            if not embed_result.success:
+                print(f"[WARNING] Embedding failed: {embed_result.message}")
             return template
         return None
 
@@ -59,5 +83,8 @@ class TemplateRepository:
             template.status = PoStatus.DELETED
             template.updated_at = datetime.utcnow()
             await template.save()
+            delete_result: ResponseSchema = await TextDocumentProcessor.delete_template(str(template.id))
+            if not delete_result.success:
+                print(f"[WARNING] Removing template from the index failed: {delete_result.message}")
             return True
         return False
@@ -2,6 +2,7 @@ from agno.agent import Agent
 from app.config import settings
 from typing import List, Dict, Any, Generator
 from agno.models.openai import OpenAIChat
+from app.services.llm_limiter import LLMPriority, limit_model_calls
 
 def gemini_pro_connector(messages: List[Dict[str, Any]], model_kwargs: Dict[str, Any], **kwargs) -> Any:
     """
@@ -51,4 +52,6 @@ agent = Agent(
         api_key=settings.GROQ_API_KEY,
         base_url=settings.GROQ_BASE_URL,
     ),
-    stream=False)
\ No newline at end of file
+    stream=False)
+# Served through AgentOS (/agno) on the same Groq key, so its calls share the limiter
+limit_model_calls(agent.model, LLMPriority.INTERACTIVE)
\ No newline at end of file
@@ -3,7 +3,7 @@ from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, field
 from functools import lru_cache
 from app.dto.risk import ClassifiedClause, ClauseType
-from app.services.segmenter import Clause_cl
+from app.services.segmenter import ExtractedClause as Clause_cl
 
 
 @dataclass
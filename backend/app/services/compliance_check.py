@@ -1,15 +1,23 @@
+import asyncio
 import json
-from typing import List, Optional, Dict
+import random
+import time
+import weakref
+from collections import deque
+from typing import Callable, Deque, List, Optional, Dict, Set, Tuple
 from pydantic import BaseModel, Field
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
-from agno.knowledge.knowledge import Knowledge 
-from agno.vectordb.qdrant import Qdrant
 from app.config import settings
-from duckduckgo_search import DDGS
+from app.services.classifier import ClauseClassifier
+from app.services.embedding import TextDocumentProcessor
+from app.services.knowledge_retriever import format_policies, search_company_policies
+from app.services.prescreen import prescreen_specialists
+from app.dto.policy import ClauseResponse, PolicyFilter
+from app.services.llm_limiter import LLMPriority, is_rate_limit_error, run_agent
+from app.services.web_search import check_external_web_data
 from datetime import datetime
 from enum import Enum
-from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
 
 # ============= ENUMS =============
@@ -111,9 +119,13 @@ class ComplianceCheckResult(BaseModel):
     contract_id: str
     analysis_timestamp: datetime = Field(default_factory=datetime.now)
     agents_used: List[AnalysisSource]
+    failed_agents: List[AnalysisSource] = Field(default_factory=list)
+    skipped_agents: List[AnalysisSource] = Field(default_factory=list)
     executive_summary: str
     recommendation: str
     required_actions: List[str] = Field(default_factory=list)
+    clauses_evaluated: Optional[int] = None
+    clauses_reused: Optional[int] = None
 
 class ClauseWithCompliance(BaseModel):
     clause_id: str
@@ -121,20 +133,8 @@ class ClauseWithCompliance(BaseModel):
     heading: Optional[str] = None
     level: int
 
-def create_base_knowledge(collection_name: str = "company_policies"):
-    vector_db = Qdrant(
-        collection=collection_name,
-        url=settings.QDRANT_URL,
-    )
-    knowledge_base = Knowledge(
-        vector_db=vector_db,
-        max_results=5,
-    )
-    return knowledge_base
-
-
-def create_compliance_agent(collection_name: str = "company_policies") -> Agent:
-    knowledge_base = create_base_knowledge(collection_name)
+def create_compliance_agent(use_knowledge: bool = True) -> Agent:
+    """use_knowledge=False when matching policies are already injected into the prompt"""
     return Agent(
         name="ComplianceChecker",
         model=OpenAIChat(
@@ -144,7 +144,8 @@ def create_compliance_agent(collection_name: str = "company_policies") -> Agent:
         ),
         instructions=[
             "You are a contract compliance expert checking against company policies.",
-            "Review each clause against retrieved company policies from the knowledge base.",
+            "Review each clause against company policies retrieved with the 'search_company_policies' tool."
+            if use_knowledge else "Review each clause against the company policies provided in the prompt.",
             "For each issue found, create a detailed finding with:",
             "- finding_id: unique ID like 'COMP-001'",
             "- finding_type: one of: policy_violation, missing_clause, weak_provision, legal_risk, financial_risk, red_flag",
@@ -162,17 +163,17 @@ def create_compliance_agent(collection_name: str = "company_policies") -> Agent:
             "",
             "CRITICAL: clause_id MUST be a STRING (e.g., '1', '2.1'), priority MUST be an INTEGER 1-5",
             "Calculate compliance score: 1.0 = fully compliant, 0.0 = completely non-compliant.",
-            "Search the knowledge base for relevant company policies before assessing each clause.",
+            "Use the 'search_company_policies' tool to find relevant company policies before assessing each clause."
+            if use_knowledge else "Only rely on the company policies listed in the prompt; do not invent other policies.",
             "Your output MUST be a JSON object: {'findings': [...], 'compliance_score': 0.85}"
         ],
-        knowledge=knowledge_base,
-        search_knowledge=True,
+        tools=[search_company_policies] if use_knowledge else [],
         stream=False,
     )
 
 
-def create_tariff_agent(collection_name: str = "company_policies") -> Agent:
-    knowledge_base = create_base_knowledge(collection_name)
+def create_tariff_agent(use_knowledge: bool = True) -> Agent:
+    """use_knowledge=False when matching policies are already injected into the prompt"""
     return Agent(
         name="TariffManagementAgent",
         model=OpenAIChat(
@@ -200,11 +201,11 @@ def create_tariff_agent(collection_name: str = "company_policies") -> Agent:
             "",
             "CRITICAL: clause_id MUST be a STRING (e.g., '1', '2.1'), priority MUST be an INTEGER 1-5",
             "Calculate compliance score: 1.0 = fully compliant, 0.0 = completely non-compliant.",
-            "Search the knowledge base for relevant financial policies before assessing.",
+            "Use the 'search_company_policies' tool to find relevant financial policies before assessing."
+            if use_knowledge else "Only rely on the company policies listed in the prompt; do not invent other policies.",
             "Your output MUST be a JSON object: {'findings': [...], 'compliance_score': 0.85}"
         ],
-        knowledge=knowledge_base,
-        search_knowledge=True,
+        tools=[search_company_policies] if use_knowledge else [],
         stream=False,
     )
 
@@ -245,21 +246,6 @@ def create_risk_review_agent() -> Agent:
         stream=False,
     )
 
-def check_external_web_data(query: str) -> str:
-    """Uses DuckDuckGo search to provide external context to the agent."""
-    try:
-        results = DDGS().text(keywords=query, max_results=5)
-        
-        formatted_results = "\n---\n".join([
-            f"Title: {r['title']}\nSnippet: {r['snippet']}\nURL: {r['href']}"
-            for r in results
-        ])
-        
-        return f"External search results for '{query}':\n{formatted_results}"
-    except Exception as e:
-        return f"External search failed: {str(e)}. No external data found for '{query}'."
-
-
 def _sanitize_finding_data(finding_data: Dict) -> Dict:
     """Sanitize finding data to match schema requirements"""
     sanitized = finding_data.copy()
@@ -300,93 +286,464 @@ def _sanitize_finding_data(finding_data: Dict) -> Dict:
     return sanitized
 
 
-def _run_specialist_agent(agent: Agent, clauses: List[ClauseWithCompliance], contract_id: str, source: AnalysisSource) -> Dict:
-    """Run a specialist agent and return partial findings"""
+def _build_specialist_prompt(
+    clauses: List[ClauseWithCompliance],
+    contract_id: str,
+    group: Optional[str] = None,
+    outline: Optional[List[ClauseWithCompliance]] = None,
+    policies: Optional[List[ClauseResponse]] = None,
+) -> str:
     clauses_text = "\n\n".join([
         f"Clause {c.clause_id} - {c.heading or 'Untitled'}:\n{c.text}"
         for c in clauses
     ])
-    prompt = f"""
+    context = ""
+    if group:
+        context += f"\nClause Group: {group}\n"
+    if outline:
+        # Headings of the whole contract, so missing-clause reasoning still works on a subset
+        outline_text = "\n".join(f"- {c.clause_id}: {c.heading or 'Untitled'}" for c in outline)
+        context += f"\nFull Contract Outline (headings only, for context):\n{outline_text}\n"
+    if policies is not None:
+        context += f"\nRelevant Company Policies:\n{format_policies(policies)}\n"
+    return f"""
 Check these contract clauses for compliance/risks.
 
 Contract ID: {contract_id}
 Total Clauses: {len(clauses)}
-
+{context}
 Contract Clauses:
 {clauses_text}
 
 Return JSON strictly in the format defined by your instructions.
 """
-    try:
-        response = agent.run(prompt, contract_id=contract_id) 
-        raw_output = (response.content or "").strip()
 
-        if not raw_output or "unable to check" in raw_output.lower():
-            return {"findings": [], "compliance_score": 1.0}
 
-        if raw_output.startswith("```"):
-            raw_output = raw_output.split("\n", 1)[1]
-            raw_output = raw_output.rsplit("```", 1)[0]
-            raw_output = raw_output.strip()
+class SpecialistAgentError(Exception):
+    """A specialist agent produced no usable result after all retries"""
+
+
+class EmptyAgentOutput(Exception):
+    """The agent answered without a usable JSON payload"""
+
+
+def _parse_specialist_output(raw_output: str) -> Dict:
+    raw_output = (raw_output or "").strip()
+
+    if not raw_output or "unable to check" in raw_output.lower():
+        raise EmptyAgentOutput(raw_output[:200] or "empty response")
 
-        data = json.loads(raw_output)
-        return data
+    if raw_output.startswith("```"):
+        raw_output = raw_output.split("\n", 1)[1]
+        raw_output = raw_output.rsplit("```", 1)[0]
+        raw_output = raw_output.strip()
+
+    data = json.loads(raw_output)
+    if not isinstance(data, dict) or "compliance_score" not in data:
+        raise EmptyAgentOutput("response has no compliance_score")
+    return data
+
+
+TRANSIENT_STATUS_CODES = {408, 425, 429, 500, 502, 503, 504}
+
+
+def _is_transient_error(exc: BaseException) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError, json.JSONDecodeError, EmptyAgentOutput)):
+        return True
+    if is_rate_limit_error(exc):
+        return True
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    if status in TRANSIENT_STATUS_CODES:
+        return True
+    message = str(exc).lower()
+    return "timeout" in message or "timed out" in message or "connection" in message
+
+
+# Recent successful call durations per specialist, used to decide when to hedge
+_specialist_latencies: Dict[AnalysisSource, Deque[float]] = {
+    source: deque(maxlen=200) for source in AnalysisSource
+}
+
+
+def _hedge_delay(source: AnalysisSource) -> Optional[float]:
+    if not settings.COMPLIANCE_HEDGE_ENABLED:
+        return None
+    samples = sorted(_specialist_latencies[source])
+    if len(samples) < settings.COMPLIANCE_HEDGE_MIN_SAMPLES:
+        return None
+    index = min(len(samples) - 1, int(len(samples) * settings.COMPLIANCE_HEDGE_PERCENTILE))
+    return samples[index]
+
+
+async def _call_specialist_agent(agent_factory: Callable[[], Agent], prompt: str, contract_id: str, source: AnalysisSource) -> Dict:
+    """
+    One attempt. When hedging is enabled and the call outlives the recent p95 latency,
+    a second identical request is started and whichever answers first wins.
+    """
+    async def call() -> Dict:
+        started = time.monotonic()
+        response = await run_agent(agent_factory(), prompt, LLMPriority.BATCH, contract_id=contract_id)
+        result = _parse_specialist_output(response.content)
+        _specialist_latencies[source].append(time.monotonic() - started)
+        return result
+
+    delay = _hedge_delay(source)
+    if delay is None:
+        return await call()
+
+    tasks = {asyncio.create_task(call())}
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if not done:
+            print(f"{source.value} slower than p95 ({delay:.1f}s), sending hedged request")
+            tasks.add(asyncio.create_task(call()))
+
+        last_error: Optional[BaseException] = None
+        while tasks:
+            done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                last_error = task.exception()
+        raise last_error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _run_specialist_agent(agent_factory: Callable[[], Agent], prompt: str, contract_id: str, source: AnalysisSource) -> Dict:
+    """Run a specialist agent, retrying transient failures with jittered exponential backoff"""
+    attempts = max(0, settings.COMPLIANCE_AGENT_MAX_RETRIES) + 1
+    for attempt in range(1, attempts + 1):
+        try:
+            return await _call_specialist_agent(agent_factory, prompt, contract_id, source)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if attempt >= attempts or not _is_transient_error(e):
+                raise SpecialistAgentError(f"{source.value} failed after {attempt} attempt(s): {e}") from e
+            backoff = min(settings.COMPLIANCE_RETRY_MAX_DELAY, settings.COMPLIANCE_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+            backoff = random.uniform(0, backoff)
+            print(f"{source.value} attempt {attempt} failed ({e}), retrying in {backoff:.1f}s")
+            await asyncio.sleep(backoff)
+
+
+SPECIALIST_AGENTS = {
+    AnalysisSource.COMPLIANCE_AGENT: ("Compliance", create_compliance_agent),
+    AnalysisSource.TARIFF_AGENT: ("Tariff", create_tariff_agent),
+    AnalysisSource.EXTERNAL_REVIEW_AGENT: ("External Review", lambda use_knowledge=True: create_risk_review_agent()),
+}
+
+# Specialists that check clauses against company policies and get them injected by pre-retrieval
+POLICY_SPECIALISTS: Set[AnalysisSource] = {AnalysisSource.COMPLIANCE_AGENT, AnalysisSource.TARIFF_AGENT}
+
+# ClauseClassifier types routed to each specialist in fan-out mode.
+# Types not listed for any specialist (boilerplate, unknown) go to the compliance agent.
+SPECIALIST_CLAUSE_GROUPS: Dict[AnalysisSource, Set[str]] = {
+    AnalysisSource.COMPLIANCE_AGENT: {
+        "DATA_PRIVACY", "CONFIDENTIALITY", "INTELLECTUAL_PROPERTY", "NON_COMPETE",
+        "ASSIGNMENT", "AUDIT_RIGHTS", "GOVERNING_LAW", "TERMINATION", "WARRANTIES",
+    },
+    AnalysisSource.TARIFF_AGENT: {
+        "PAYMENT_TERMS", "INSURANCE", "LIABILITY", "INDEMNITY", "AUDIT_RIGHTS",
+    },
+    AnalysisSource.EXTERNAL_REVIEW_AGENT: {
+        "LIABILITY", "INDEMNITY", "TERMINATION", "FORCE_MAJEURE", "GOVERNING_LAW",
+        "WARRANTIES", "INTELLECTUAL_PROPERTY",
+    },
+}
+
+# One per event loop: check_compliance runs each check in its own loop via asyncio.run
+_specialist_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _get_specialist_semaphore() -> asyncio.Semaphore:
+    """Cap on concurrently running specialist calls within the running event loop"""
+    loop = asyncio.get_running_loop()
+    semaphore = _specialist_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _specialist_semaphores[loop] = asyncio.Semaphore(settings.COMPLIANCE_MAX_CONCURRENT_AGENTS)
+    return semaphore
+
+
+async def _retrieve_policy_context(clauses: List[ClauseWithCompliance]) -> Optional[Dict[str, List[ClauseResponse]]]:
+    """
+    Embed all clauses in one batch and run one batched Qdrant search, returning the
+    policy hits per clause id. None means retrieval failed and agents should fall
+    back to searching the policies themselves.
+    """
+    if not clauses:
+        return {}
+    texts = [f"{c.heading or ''}\n{c.text}".strip() for c in clauses]
+    response = await TextDocumentProcessor.retrieve_policies_batch(
+        texts,
+        top_k=settings.COMPLIANCE_POLICIES_PER_CLAUSE,
+        policy_filter=PolicyFilter(country=settings.COMPLIANCE_POLICY_COUNTRY),
+    )
+    if not response.success:
+        print(f"[WARNING] Policy pre-retrieval failed, falling back to agent policy search: {response.message}")
+        return None
+    return {c.clause_id: hits for c, hits in zip(clauses, response.data)}
 
-    except Exception as e:
-        print(f"Error in specialist agent: {e}")
-        return {"findings": [], "compliance_score": 1.0}
 
+def _policies_for_clauses(
+    policy_hits: Dict[str, List[ClauseResponse]],
+    clauses: List[ClauseWithCompliance],
+) -> List[ClauseResponse]:
+    """
+    Distinct policies matched by any of the clauses, best first. Hits are ranked by the
+    retrieval's rank_score when set, since score is 0.0 for keyword-only hybrid matches.
+    """
+    def rank(hit: ClauseResponse) -> float:
+        return hit.rank_score if hit.rank_score is not None else hit.score
+
+    best: Dict[str, ClauseResponse] = {}
+    for clause in clauses:
+        for hit in policy_hits.get(clause.clause_id, []):
+            if hit.clause_id not in best or rank(hit) > rank(best[hit.clause_id]):
+                best[hit.clause_id] = hit
+    ranked = sorted(best.values(), key=rank, reverse=True)
+    return ranked[:settings.COMPLIANCE_MAX_POLICIES]
+
+
+async def _run_specialist_job(
+    source: AnalysisSource,
+    clauses: List[ClauseWithCompliance],
+    contract_id: str,
+    group: Optional[str] = None,
+    outline: Optional[List[ClauseWithCompliance]] = None,
+    policy_hits: Optional[Dict[str, List[ClauseResponse]]] = None,
+) -> Dict:
+    name, factory = SPECIALIST_AGENTS[source]
+    policies = None
+    if policy_hits is not None and source in POLICY_SPECIALISTS:
+        policies = _policies_for_clauses(policy_hits, clauses)
+    use_knowledge = policies is None
+    async with _get_specialist_semaphore():
+        print(f"Checking {name.lower()} risks for contract {contract_id}, clauses: {len(clauses)}" + (f", group: {group}" if group else ""))
+        prompt = _build_specialist_prompt(clauses, contract_id, group=group, outline=outline, policies=policies)
+        return await _run_specialist_agent(lambda: factory(use_knowledge), prompt, contract_id, source)
+
+
+async def check_compliance_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> Dict:
+    return await _run_specialist_job(AnalysisSource.COMPLIANCE_AGENT, clauses, contract_id)
+
+
+async def check_tariff_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> Dict:
+    return await _run_specialist_job(AnalysisSource.TARIFF_AGENT, clauses, contract_id)
+
+
+async def check_external_context_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> Dict:
+    return await _run_specialist_job(AnalysisSource.EXTERNAL_REVIEW_AGENT, clauses, contract_id)
+
+
+def _group_clauses_for_specialists(clauses: List[ClauseWithCompliance]) -> Dict[AnalysisSource, Dict[str, List[ClauseWithCompliance]]]:
+    """Classify clauses locally and route each clause-type group to the specialists that need it"""
+    classified = ClauseClassifier().classify_clauses(clauses)
+
+    by_type: Dict[str, List[ClauseWithCompliance]] = {}
+    for clause, classified_clause in zip(clauses, classified):
+        by_type.setdefault(classified_clause.clause_type, []).append(clause)
+
+    groups: Dict[AnalysisSource, Dict[str, List[ClauseWithCompliance]]] = {source: {} for source in SPECIALIST_AGENTS}
+    for clause_type, members in by_type.items():
+        targets = [s for s, types in SPECIALIST_CLAUSE_GROUPS.items() if clause_type in types]
+        for source in targets or [AnalysisSource.COMPLIANCE_AGENT]:
+            groups[source][clause_type] = members
+    return groups
+
+
+def _plan_specialist_jobs(
+    clauses: List[ClauseWithCompliance],
+    fan_out: bool,
+    skip: Optional[Set[AnalysisSource]] = None,
+) -> List[Tuple[AnalysisSource, List[ClauseWithCompliance], Optional[str]]]:
+    skip = skip or set()
+    if not fan_out:
+        return [(source, clauses, None) for source in SPECIALIST_AGENTS if source not in skip]
+
+    max_clauses = max(1, settings.COMPLIANCE_GROUP_MAX_CLAUSES)
+    jobs = []
+    for source, groups in _group_clauses_for_specialists(clauses).items():
+        if source in skip:
+            continue
+        for clause_type, members in groups.items():
+            for i in range(0, len(members), max_clauses):
+                jobs.append((source, members[i:i + max_clauses], clause_type))
+    return jobs
+
+
+def _ensure_unique_finding_ids(findings: List[Dict]) -> List[Dict]:
+    """Each agent call numbers its findings from 001, keep ids unique once calls are merged"""
+    unique = []
+    seen_ids = set()
+    for finding in findings:
+        finding_id = str(finding.get("finding_id", ""))
+        if finding_id in seen_ids:
+            suffix = 2
+            while f"{finding_id}-{suffix}" in seen_ids:
+                suffix += 1
+            finding = {**finding, "finding_id": f"{finding_id}-{suffix}"}
+            finding_id = finding["finding_id"]
+        seen_ids.add(finding_id)
+        unique.append(finding)
+    return unique
+
+
+def _merge_specialist_results(results: List[Tuple[Dict, List[ClauseWithCompliance]]]) -> Dict:
+    """Merge per-group results of one specialist; the score is weighted by clause count"""
+    findings = []
+    clause_scores: Dict[str, float] = {}
+    weighted_score = 0.0
+    total_weight = 0
+    for result, members in results:
+        findings.extend(result.get("findings") or [])
+        score = result.get("compliance_score", 1.0)
+        for clause in members:
+            clause_scores[clause.clause_id] = score
+        weighted_score += score * len(members)
+        total_weight += len(members)
+
+    score = weighted_score / total_weight if total_weight else 1.0
+    return {
+        "findings": _ensure_unique_finding_ids(findings),
+        "compliance_score": score,
+        "clause_scores": clause_scores,
+    }
 
-def check_compliance_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> Dict:
-    print(f"Checking compliance risks for contract {contract_id}, clauses: {len(clauses)}")
-    risk_agent = create_compliance_agent()
-    return _run_specialist_agent(risk_agent, clauses, contract_id, AnalysisSource.COMPLIANCE_AGENT)
 
+async def _run_specialists(
+    clauses: List[ClauseWithCompliance],
+    contract_id: str,
+    timeout: float,
+    fan_out: bool,
+    outline: Optional[List[ClauseWithCompliance]] = None,
+    prescreen: Optional[bool] = None,
+) -> Tuple[Dict[AnalysisSource, Dict], Dict[AnalysisSource, str], Set[AnalysisSource]]:
+    """
+    Run every specialist job under one shared deadline.
+    Returns merged results per specialist, the reason for each specialist that
+    timed out or failed (a failed specialist never contributes a score), and the
+    specialists the local pre-screen found unnecessary.
+    """
+    started_at = time.monotonic()
+    prescreen = settings.COMPLIANCE_PRESCREEN_ENABLED if prescreen is None else prescreen
+    if outline is None and fan_out:
+        outline = clauses
+
+    policy_hits = None
+    if settings.COMPLIANCE_PRE_RETRIEVAL or prescreen:
+        policy_hits = await _retrieve_policy_context(clauses)
+
+    skipped: Set[AnalysisSource] = set()
+    if prescreen:
+        screen = prescreen_specialists(
+            clauses,
+            {source: SPECIALIST_CLAUSE_GROUPS.get(source, set()) for source in SPECIALIST_AGENTS},
+            AnalysisSource.COMPLIANCE_AGENT,
+            policy_hits=policy_hits,
+        )
+        skipped = screen.skipped
+        if skipped:
+            print(f"Pre-screen for contract {contract_id} skipped: " + ", ".join(
+                f"{s.value} (risk {screen.specialist_risk[s]:.2f})" for s in skipped
+            ))
+    if not settings.COMPLIANCE_PRE_RETRIEVAL:
+        policy_hits = None
 
-def check_tariff_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> Dict:
-    print(f"Checking tariff risks for contract {contract_id}, clauses: {len(clauses)}")
-    tariff_agent = create_tariff_agent()
-    return _run_specialist_agent(tariff_agent, clauses, contract_id, AnalysisSource.TARIFF_AGENT)
+    jobs = _plan_specialist_jobs(clauses, fan_out, skip=skipped)
+    remaining = max(0.0, timeout - (time.monotonic() - started_at))
 
+    tasks = {
+        asyncio.create_task(_run_specialist_job(source, members, contract_id, group=group, outline=outline, policy_hits=policy_hits)): (source, members)
+        for source, members, group in jobs
+    }
+    done, pending = await asyncio.wait(tasks.keys(), timeout=remaining) if tasks else (set(), set())
+
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    # Collect in a stable order so findings do not depend on completion order
+    partials: Dict[AnalysisSource, List[Tuple[Dict, List[ClauseWithCompliance]]]] = {}
+    failures: Dict[AnalysisSource, str] = {}
+    for task, (source, members) in tasks.items():
+        name = SPECIALIST_AGENTS[source][0]
+        if task not in done:
+            print(f"{name} agent timed out after {timeout} seconds")
+            failures.setdefault(source, f"timed out after {timeout} seconds")
+            continue
+        try:
+            partials.setdefault(source, []).append((task.result(), members))
+        except Exception as e:
+            print(f"{name} agent error: {e}")
+            failures.setdefault(source, str(e))
 
-def check_external_context_risks(clauses: List[ClauseWithCompliance], contract_id: str) -> Dict:
-    print(f"Checking external context risks for contract {contract_id}, clauses: {len(clauses)}")
-    risk_review_agent = create_risk_review_agent()
-    return _run_specialist_agent(risk_review_agent, clauses, contract_id, AnalysisSource.EXTERNAL_REVIEW_AGENT)
+    results = {
+        source: _merge_specialist_results(results)
+        for source, results in partials.items()
+        if source not in failures
+    }
+    return results, failures, skipped
 
 
-def check_compliance(clauses: List[ClauseWithCompliance], contract_id: str, collection_name: str = "company_policies") -> ComplianceCheckResult:
+async def check_compliance_async(
+    clauses: List[ClauseWithCompliance],
+    contract_id: str,
+    timeout: Optional[float] = None,
+    fan_out: Optional[bool] = None,
+    prescreen: Optional[bool] = None,
+) -> ComplianceCheckResult:
     """
-    Main compliance checking function that orchestrates multiple specialist agents in parallel
+    Orchestrates the specialist agents concurrently on the event loop.
+
+    All agents share a single deadline (settings.COMPLIANCE_CHECK_TIMEOUT by default);
+    agents still running when it expires are cancelled and left out of the result.
+    With fan_out, clauses are grouped by ClauseClassifier type and each specialist
+    only receives the groups relevant to it, as several smaller concurrent calls.
+    With prescreen, specialists whose clauses show no local risk signal are skipped.
     """
+    timeout = settings.COMPLIANCE_CHECK_TIMEOUT if timeout is None else timeout
+    fan_out = settings.COMPLIANCE_FAN_OUT if fan_out is None else fan_out
+
+    results, failures, skipped = await _run_specialists(clauses, contract_id, timeout, fan_out, prescreen=prescreen)
+
     agents_used = []
     all_findings = []
     scores = []
-    
-    # Run all three agents in parallel using ThreadPoolExecutor
-    with ThreadPoolExecutor(max_workers=3) as executor:
-        # Submit all agents at once
-        compliance_future = executor.submit(check_compliance_risks, clauses, contract_id)
-        tariff_future = executor.submit(check_tariff_risks, clauses, contract_id)
-        external_future = executor.submit(check_external_context_risks, clauses, contract_id)
-        
-        # Collect results with timeout (30 seconds per agent)
-        for future, source, name in [
-            (compliance_future, AnalysisSource.COMPLIANCE_AGENT, "Compliance"),
-            (tariff_future, AnalysisSource.TARIFF_AGENT, "Tariff"),
-            (external_future, AnalysisSource.EXTERNAL_REVIEW_AGENT, "External Review")
-        ]:
-            try:
-                result = future.result(timeout=30)
-                if result.get("findings"):
-                    all_findings.extend(result["findings"])
-                scores.append(result.get("compliance_score", 1.0))
-                agents_used.append(source)
-            except FutureTimeoutError:
-                print(f"{name} agent timed out after 30 seconds")
-            except Exception as e:
-                print(f"{name} agent error: {e}")
-    
+    for source, result in results.items():
+        all_findings.extend(result["findings"])
+        scores.append(result["compliance_score"])
+        agents_used.append(source)
+
+    return _build_compliance_result(all_findings, scores, agents_used, contract_id, failed_agents=list(failures), skipped_agents=list(skipped))
+
+
+def check_compliance(clauses: List[ClauseWithCompliance], contract_id: str) -> ComplianceCheckResult:
+    """
+    Synchronous entry point for scripts and workers without a running event loop.
+    Request handlers should await check_compliance_async instead.
+    """
+    return asyncio.run(check_compliance_async(clauses, contract_id))
+
+
+def _build_compliance_result(
+    all_findings: List[Dict],
+    scores: List[float],
+    agents_used: List[AnalysisSource],
+    contract_id: str,
+    failed_agents: Optional[List[AnalysisSource]] = None,
+    skipped_agents: Optional[List[AnalysisSource]] = None,
+) -> ComplianceCheckResult:
+    """
+    Turn the raw specialist output into a scored ComplianceCheckResult.
+    Failed agents are reported and block an APPROVE recommendation.
+    """
+    failed_agents = failed_agents or []
+    skipped_agents = skipped_agents or []
+    if failed_agents and not agents_used:
+        raise SpecialistAgentError(f"All compliance agents failed: {', '.join(a.value for a in failed_agents)}")
     # Convert raw findings to ComplianceFinding objects
     findings_objects = []
     for finding_data in all_findings:
@@ -443,6 +800,13 @@ def check_compliance(clauses: List[ClauseWithCompliance], contract_id: str, coll
     else:
         summary = f"Contract has significant compliance issues with {len(findings_objects)} findings, including {critical_count} critical and {high_count} high severity issues."
         recommendation = "REVIEW_REQUIRED"
+
+    if failed_agents:
+        # A missing agent must never read as a clean bill of health
+        summary += f" Analysis incomplete: {', '.join(a.value for a in failed_agents)} did not complete."
+        recommendation = "REVIEW_REQUIRED"
+    if skipped_agents:
+        summary += f" Pre-screen found no risk signals for {', '.join(a.value for a in skipped_agents)}, which were not run."
     
     # Required actions only
     required_actions = [f.title for f in findings_objects if f.severity in [Severity.CRITICAL, Severity.HIGH]]
@@ -453,6 +817,8 @@ def check_compliance(clauses: List[ClauseWithCompliance], contract_id: str, coll
         contract_id=contract_id,
         analysis_timestamp=datetime.now(),
         agents_used=agents_used,
+        failed_agents=failed_agents,
+        skipped_agents=skipped_agents,
         executive_summary=summary,
         recommendation=recommendation,
         required_actions=required_actions[:10]  # Top 10 required actions
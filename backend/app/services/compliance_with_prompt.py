@@ -4,9 +4,9 @@ from app.models.documentUploaded import clause
 from pydantic import BaseModel
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
-from agno.knowledge.knowledge import Knowledge
-from agno.vectordb.qdrant import Qdrant
 from app.config import settings
+from app.services.knowledge_retriever import search_company_policies
+from app.services.llm_limiter import LLMPriority, run_agent
 
 
 class ClauseWithCompliance(BaseModel):
@@ -16,17 +16,7 @@ class ClauseWithCompliance(BaseModel):
     level: int
 
 
-def create_compliance_agent(collection_name: str = "company_policies") -> Agent:
-    vector_db = Qdrant(
-        collection=collection_name,
-        url=settings.QDRANT_URL,
-    )
-    
-    knowledge_base = Knowledge(
-        vector_db=vector_db,
-        max_results=5,
-    )
-    
+def create_compliance_agent() -> Agent:
     return Agent(
         name="ContractDraftingExpert",
         model=OpenAIChat(
@@ -36,21 +26,19 @@ def create_compliance_agent(collection_name: str = "company_policies") -> Agent:
         ),
         instructions=[
             "You are a contract drafting expert who revises contracts based on user instructions while ensuring compliance with company policies.",
-            "Search the knowledge base for relevant company policies before drafting the revision.",
+            "Use the 'search_company_policies' tool to find relevant company policies before drafting the revision.",
             "Your output must be the final, revised contract text only.",
         ],
-        knowledge=knowledge_base,
-        search_knowledge=True,
+        tools=[search_company_policies],
         stream=False,
     )
 
 
-def modify_contract_text(
+async def modify_contract_text(
     clauses: str,
-    collection_name: str = "company_policies",
     user_prompt: str = None,
 ) -> str:
-    agent = create_compliance_agent(collection_name)
+    agent = create_compliance_agent()
 
     # --- STRICTLY REVISED PROMPT TEMPLATE ---
     prompt = f"""
@@ -58,7 +46,7 @@ def modify_contract_text(
     <CONTRACT_TEXT> section below according to the instruction in the <USER_INSTRUCTION> section.
     
     You **MUST** ensure the entire resulting text maintains strict compliance with all company policies 
-    found in your knowledge base.
+    found with your policy search tool.
     
     ---
     
@@ -79,7 +67,7 @@ def modify_contract_text(
     """
     
     try:
-        response = agent.run(prompt)
+        response = await run_agent(agent, prompt, LLMPriority.INTERACTIVE)
         # We strip any surrounding quotes or backticks that the LLM might add due to the strict instruction
         raw_output = (response.content or "").strip()
         
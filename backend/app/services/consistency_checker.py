@@ -6,7 +6,7 @@ from agno.models.openai import OpenAIChat
 from agno.knowledge.knowledge import Knowledge 
 from agno.vectordb.qdrant import Qdrant
 from app.config import settings
-from duckduckgo_search import DDGS 
+from app.services.web_search import check_external_web_data
 
 
 class ComplianceRisk(BaseModel):
@@ -109,21 +109,6 @@ def create_risk_review_agent() -> Agent:
         stream=False,
     )
 
-def check_external_web_data(query: str) -> str:
-    """Uses DuckDuckGo search to provide external context to the agent."""
-    try:
-        results = DDGS().text(keywords=query, max_results=5)
-        
-        formatted_results = "\n---\n".join([
-            f"Title: {r['title']}\nSnippet: {r['snippet']}\nURL: {r['href']}"
-            for r in results
-        ])
-        
-        return f"External search results for '{query}':\n{formatted_results}"
-    except Exception as e:
-        return f"External search failed: {str(e)}. No external data found for '{query}'."
-
-
 def _run_specialist_agent(agent: Agent, clauses: List[ClauseWithCompliance], contract_id: str) -> ComplianceCheckResult:
     clauses_text = "\n\n".join([
         f"Clause {c.clause_id} - {c.heading or 'Untitled'}:\n{c.text}"
@@ -0,0 +1,282 @@
+import asyncio
+import hashlib
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+from app.models.embedding import EmbeddingCacheEntry
+from app.repositories.embedding import EmbeddingCacheRepository
+
+
+class Embedder(ABC):
+    """Turns texts into vectors. Implementations must keep the input order."""
+
+    model_name: str = ""
+    dimension: Optional[int] = None
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        ...
+
+    async def get_dimension(self) -> int:
+        """Vector size produced by this embedder, probed with one call if not known up front"""
+        if self.dimension is None:
+            self.dimension = len((await self.embed(["dimension probe"]))[0])
+        return self.dimension
+
+
+# Native output size of known Gemini embedding models, avoids a probe call at startup
+GEMINI_MODEL_DIMENSIONS = {
+    "gemini-embedding-001": 3072,
+    "models/gemini-embedding-001": 3072,
+    "text-embedding-004": 768,
+    "models/text-embedding-004": 768,
+}
+
+
+class GeminiEmbedder(Embedder):
+    """Gemini embedding API, EMBEDDING_BATCH_SIZE texts per request, EMBEDDING_CONCURRENCY requests at a time"""
+
+    def __init__(self, model_name: Optional[str] = None, dimension: Optional[int] = None):
+        import google.generativeai as genai
+
+        genai.configure(api_key=settings.GOOGLE_EMBEDDING_API_KEY)
+        self.client = genai
+        self.model_name = model_name or settings.EMBEDDING_MODEL
+        self.output_dimensionality = dimension
+        self.dimension = dimension or GEMINI_MODEL_DIMENSIONS.get(self.model_name)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(settings.EMBEDDING_CONCURRENCY)
+        return self._semaphore
+
+    async def _embed_batch(self, batch: List[str]) -> List[List[float]]:
+        kwargs = {"output_dimensionality": self.output_dimensionality} if self.output_dimensionality else {}
+        async with self._get_semaphore():
+            # The Gemini SDK is blocking: run it in a worker thread to keep the event loop free
+            response = await asyncio.to_thread(
+                self.client.embed_content,
+                model=self.model_name,
+                content=batch,
+                **kwargs,
+            )
+        return response["embedding"]
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        size = max(1, settings.EMBEDDING_BATCH_SIZE)
+        batches = [texts[i:i + size] for i in range(0, len(texts), size)]
+        results = await asyncio.gather(*(self._embed_batch(b) for b in batches))
+        return [vector for batch_vectors in results for vector in batch_vectors]
+
+
+class LocalEmbedder(Embedder):
+    """
+    CPU sentence-transformers model, no network calls once the model is downloaded.
+    Needs the optional `local-embeddings` dependencies (sentence-transformers).
+    """
+
+    def __init__(self, model_name: Optional[str] = None):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise RuntimeError(
+                "EMBEDDING_BACKEND=local requires sentence-transformers; install the 'local-embeddings' extra"
+            ) from e
+
+        self.model_name = model_name or settings.LOCAL_EMBEDDING_MODEL
+        kwargs = {"backend": "onnx"} if settings.LOCAL_EMBEDDING_ONNX else {}
+        self.model = SentenceTransformer(self.model_name, device="cpu", **kwargs)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        # Inference is CPU bound, one encode call at a time
+        self._lock = asyncio.Lock()
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        return self.model.encode(
+            texts,
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        ).tolist()
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        async with self._lock:
+            return await asyncio.to_thread(self._encode, texts)
+
+
+class BatchingEmbedder(Embedder):
+    """
+    Queue in front of another embedder. Texts from concurrent callers (e.g. many
+    single-query retrievals) are collected for up to EMBEDDING_QUEUE_MAX_WAIT_MS
+    or EMBEDDING_BATCH_SIZE texts and embedded together.
+    """
+
+    def __init__(self, inner: Embedder):
+        self.inner = inner
+        self.model_name = inner.model_name
+        self.dimension = inner.dimension
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        if self._queue is None or self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        return self._queue
+
+    async def _run(self) -> None:
+        queue = self._queue
+        max_wait = settings.EMBEDDING_QUEUE_MAX_WAIT_MS / 1000.0
+        max_batch = max(1, settings.EMBEDDING_BATCH_SIZE)
+        while True:
+            pending: List[Tuple[str, asyncio.Future]] = [await queue.get()]
+            deadline = asyncio.get_running_loop().time() + max_wait
+            while len(pending) < max_batch:
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            pending = [(text, future) for text, future in pending if not future.done()]
+            if not pending:
+                continue
+            try:
+                vectors = await self.inner.embed([text for text, _ in pending])
+            except Exception as e:
+                for _, future in pending:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), vector in zip(pending, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        # Large inputs are already batched, send them straight through
+        if len(texts) >= settings.EMBEDDING_BATCH_SIZE:
+            return await self.inner.embed(texts)
+        queue = self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        futures = [loop.create_future() for _ in texts]
+        for text, future in zip(texts, futures):
+            queue.put_nowait((text, future))
+        return list(await asyncio.gather(*futures))
+
+    async def get_dimension(self) -> int:
+        self.dimension = await self.inner.get_dimension()
+        return self.dimension
+
+
+def _pack_vector(vector: List[float]) -> bytes:
+    return array("f", vector).tobytes()
+
+
+def _unpack_vector(data: bytes) -> List[float]:
+    vector = array("f")
+    vector.frombytes(data)
+    return vector.tolist()
+
+
+class CachingEmbedder(Embedder):
+    """
+    Two-tier embedding cache keyed by (model, normalised text hash): an in-process
+    LRU of EMBEDDING_CACHE_SIZE vectors in front of the Mongo embedding_cache
+    collection. Only texts missing from both tiers reach the wrapped embedder.
+    """
+
+    def __init__(self, inner: Embedder, max_entries: Optional[int] = None):
+        self.inner = inner
+        self.model_name = inner.model_name
+        self.dimension = inner.dimension
+        self.max_entries = settings.EMBEDDING_CACHE_SIZE if max_entries is None else max_entries
+        self._lru: "OrderedDict[str, List[float]]" = OrderedDict()
+        self.hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+
+    def _model_key(self) -> str:
+        # Vectors of different sizes from the same model must not be mixed up
+        return f"{self.model_name}:{self.dimension or ''}"
+
+    def cache_key(self, text: str) -> str:
+        normalized = " ".join(text.split())
+        return hashlib.sha256(f"{self._model_key()}\n{normalized}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    async def embed(self, texts: List[str]) -> List[List[float]]:
+        keys = [self.cache_key(t) for t in texts]
+        found: Dict[str, List[float]] = {}
+        for key in keys:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                found[key] = self._lru[key]
+        self.hits += sum(1 for key in keys if key in found)
+
+        missing = list(dict.fromkeys(key for key in keys if key not in found))
+        if missing:
+            try:
+                stored = await EmbeddingCacheRepository.get_many(missing)
+            except Exception as e:
+                print(f"[WARNING] Embedding cache lookup failed: {e}")
+                stored = {}
+            for key, entry in stored.items():
+                found[key] = _unpack_vector(entry.vector)
+                self._remember(key, found[key])
+            self.persistent_hits += len(stored)
+
+        to_embed = {key: text for key, text in zip(keys, texts) if key not in found}
+        if to_embed:
+            self.misses += len(to_embed)
+            vectors = await self.inner.embed(list(to_embed.values()))
+            new_entries = []
+            for key, vector in zip(to_embed, vectors):
+                found[key] = vector
+                self._remember(key, vector)
+                new_entries.append(EmbeddingCacheEntry(
+                    key=key,
+                    model=self._model_key(),
+                    dimension=len(vector),
+                    vector=_pack_vector(vector),
+                ))
+            try:
+                await EmbeddingCacheRepository.save_many(new_entries)
+            except Exception as e:
+                print(f"[WARNING] Embedding cache write failed: {e}")
+
+        return [found[key] for key in keys]
+
+    async def get_dimension(self) -> int:
+        self.dimension = await self.inner.get_dimension()
+        return self.dimension
+
+
+def create_embedder(backend: Optional[str] = None) -> Embedder:
+    """
+    Embedder selected by settings.EMBEDDING_BACKEND ("gemini" or "local"), behind the
+    batching queue and, unless EMBEDDING_CACHE_ENABLED is off, the embedding cache
+    """
+    backend = (backend or settings.EMBEDDING_BACKEND).lower()
+    if backend == "gemini":
+        inner: Embedder = GeminiEmbedder(dimension=settings.EMBEDDING_DIMENSION)
+    elif backend == "local":
+        inner = LocalEmbedder()
+    else:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND '{backend}', expected 'gemini' or 'local'")
+    embedder: Embedder = BatchingEmbedder(inner)
+    if settings.EMBEDDING_CACHE_ENABLED:
+        embedder = CachingEmbedder(embedder)
+    return embedder
@@ -1,16 +1,28 @@
-from typing import Any, List, Optional
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
 import uuid
 from qdrant_client import AsyncQdrantClient
-import google.generativeai as genai
 from app.config import settings
 from qdrant_client.models import PointStruct
 from pydantic import BaseModel
-from app.dto.policy import ClauseResponse
-from app.models.policy import Template
-from qdrant_client.models import VectorParams,Distance
-
-
-genai.configure(api_key=settings.GOOGLE_EMBEDDING_API_KEY)
+from app.dto.policy import ClauseResponse, PolicyFilter
+from app.models.policy import Clause, Template
+from qdrant_client.models import VectorParams,Distance,SearchRequest
+from qdrant_client.models import FieldCondition, Filter, FilterSelector, MatchAny, MatchValue, PayloadSchemaType, PointIdsList
+from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    Disabled,
+    HnswConfigDiff,
+    QuantizationSearchParams,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    SearchParams,
+    VectorParamsDiff,
+)
+from app.services.embedders import Embedder, create_embedder
+from app.services.sparse_index import BM25Index, reciprocal_rank_fusion, tokenize
 
 
 class ResponseSchema(BaseModel):
@@ -19,17 +31,33 @@ class ResponseSchema(BaseModel):
     data: Optional[Any] = None
 
 
+# Namespace for uuid5 point ids derived from (template_id, clause_id)
+POINT_ID_NAMESPACE = uuid.UUID("6f1c1b1e-3c55-4d0e-9a51-7f4f2f0c9b21")
+
+# Payload fields used in search filters and template sync, indexed in Qdrant
+PAYLOAD_INDEXES = {
+    "template_id": PayloadSchemaType.KEYWORD,
+    "country": PayloadSchemaType.KEYWORD,
+    "policy_type": PayloadSchemaType.KEYWORD,
+    "status": PayloadSchemaType.KEYWORD,
+    "version": PayloadSchemaType.INTEGER,
+}
+
+
 class TextDocumentProcessor:
     qdrant: Optional[AsyncQdrantClient] = None
-    gemini_client: Optional[Any] = None
+    embedder: Optional[Embedder] = None
     collection_name: Optional[str] = None
+    sparse_index: BM25Index = BM25Index()
 
     @staticmethod
-    async def init(client: AsyncQdrantClient, collection_name: str = "template_clauses_1", vector_size: int = 1536) -> None:
+    async def init(client: AsyncQdrantClient, collection_name: str = settings.QDRANT_COLLECTION, embedder: Optional[Embedder] = None) -> None:
         TextDocumentProcessor.qdrant = client
-        TextDocumentProcessor.gemini_client = genai
+        TextDocumentProcessor.embedder = embedder or create_embedder()
         TextDocumentProcessor.collection_name = collection_name
-        print("[DEBUG] TextDocumentProcessor initialized")
+        print(f"[DEBUG] TextDocumentProcessor initialized with {settings.EMBEDDING_BACKEND} embeddings ({TextDocumentProcessor.embedder.model_name})")
+
+        vector_size = await TextDocumentProcessor.embedder.get_dimension()
 
         existing_collections = await TextDocumentProcessor.qdrant.get_collections()
         if collection_name not in [c.name for c in existing_collections.collections]:
@@ -37,104 +65,457 @@ class TextDocumentProcessor:
             await TextDocumentProcessor.qdrant.create_collection(
                 collection_name=collection_name,
                 vectors_config=VectorParams(
-                    size=3072,       
-                    distance=Distance.COSINE
-                )
+                    size=vector_size,
+                    distance=Distance.COSINE,
+                    on_disk=settings.QDRANT_VECTORS_ON_DISK,
+                ),
+                hnsw_config=TextDocumentProcessor._hnsw_config(),
+                quantization_config=TextDocumentProcessor._quantization_config(),
             )
             print(f"[DEBUG] Collection '{collection_name}' created")
         else:
             print(f"[DEBUG] Collection '{collection_name}' already exists")
+            info = await TextDocumentProcessor.qdrant.get_collection(collection_name)
+            collection_size = info.config.params.vectors.size
+            if collection_size != vector_size:
+                raise RuntimeError(
+                    f"Collection '{collection_name}' holds {collection_size}-dim vectors but the "
+                    f"{settings.EMBEDDING_BACKEND} embedder produces {vector_size}-dim vectors; "
+                    f"use another collection or re-index the templates"
+                )
+            await TextDocumentProcessor._migrate_collection(collection_name, info)
+
+        await TextDocumentProcessor._ensure_payload_indexes(collection_name)
+        try:
+            count = await TextDocumentProcessor.build_sparse_index()
+            print(f"[DEBUG] Sparse index built with {count} clauses")
+        except Exception as e:
+            print(f"[WARNING] Sparse index build failed, retrieval falls back to dense only: {e}")
+
+    @staticmethod
+    async def build_sparse_index() -> int:
+        """(Re)build the BM25 index from the clause payloads stored in Qdrant"""
+        index = BM25Index()
+        offset = None
+        while True:
+            points, offset = await TextDocumentProcessor.qdrant.scroll(
+                collection_name=TextDocumentProcessor.collection_name,
+                limit=512,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            for point in points:
+                payload = point.payload or {}
+                index.upsert(str(point.id), f"{payload.get('title', '')}\n{payload.get('text', '')}", payload)
+            if offset is None:
+                break
+        TextDocumentProcessor.sparse_index = index
+        return len(index)
+
+    @staticmethod
+    def _quantization_config():
+        """Quantization from settings.QDRANT_QUANTIZATION: "none", "scalar" (int8) or "binary" """
+        mode = settings.QDRANT_QUANTIZATION.lower()
+        if mode == "none":
+            return None
+        if mode == "scalar":
+            return ScalarQuantization(scalar=ScalarQuantizationConfig(
+                type=ScalarType.INT8,
+                quantile=0.99,
+                always_ram=settings.QDRANT_QUANTIZATION_ALWAYS_RAM,
+            ))
+        if mode == "binary":
+            return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=settings.QDRANT_QUANTIZATION_ALWAYS_RAM))
+        raise ValueError(f"Unknown QDRANT_QUANTIZATION '{settings.QDRANT_QUANTIZATION}', expected 'none', 'scalar' or 'binary'")
+
+    @staticmethod
+    def _quantization_mode(config: Any) -> str:
+        if config is None:
+            return "none"
+        if isinstance(config, ScalarQuantization):
+            return "scalar"
+        if isinstance(config, BinaryQuantization):
+            return "binary"
+        return "other"
+
+    @staticmethod
+    def _hnsw_config() -> HnswConfigDiff:
+        return HnswConfigDiff(
+            m=settings.QDRANT_HNSW_M,
+            ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT,
+            on_disk=settings.QDRANT_HNSW_ON_DISK,
+        )
+
+    @staticmethod
+    def search_params(exact: bool = False) -> SearchParams:
+        quantization = None
+        if settings.QDRANT_QUANTIZATION.lower() != "none":
+            quantization = QuantizationSearchParams(
+                ignore=exact,
+                rescore=settings.QDRANT_RESCORE,
+                oversampling=settings.QDRANT_OVERSAMPLING,
+            )
+        return SearchParams(hnsw_ef=settings.QDRANT_HNSW_EF, exact=exact, quantization=quantization)
+
+    @staticmethod
+    async def _migrate_collection(collection_name: str, info: Any) -> None:
+        """
+        Bring an existing collection to the configured storage, HNSW and quantization
+        settings. Qdrant applies the change in place and rebuilds the index in the background.
+        """
+        changes = {}
+        vectors = info.config.params.vectors
+        if bool(vectors.on_disk) != settings.QDRANT_VECTORS_ON_DISK:
+            changes["vectors_config"] = {"": VectorParamsDiff(on_disk=settings.QDRANT_VECTORS_ON_DISK)}
+
+        hnsw = info.config.hnsw_config
+        if (hnsw.m, hnsw.ef_construct, bool(hnsw.on_disk)) != (
+            settings.QDRANT_HNSW_M, settings.QDRANT_HNSW_EF_CONSTRUCT, settings.QDRANT_HNSW_ON_DISK
+        ):
+            changes["hnsw_config"] = TextDocumentProcessor._hnsw_config()
+
+        quantization = TextDocumentProcessor._quantization_config()
+        if TextDocumentProcessor._quantization_mode(info.config.quantization_config) != settings.QDRANT_QUANTIZATION.lower():
+            changes["quantization_config"] = quantization if quantization is not None else Disabled.DISABLED
+
+        if not changes:
+            return
+        print(f"[DEBUG] Migrating collection '{collection_name}': {', '.join(changes)}")
+        await TextDocumentProcessor.qdrant.update_collection(collection_name=collection_name, **changes)
+
+    @staticmethod
+    async def _ensure_payload_indexes(collection_name: str) -> None:
+        info = await TextDocumentProcessor.qdrant.get_collection(collection_name)
+        existing = info.payload_schema or {}
+        for field_name, schema in PAYLOAD_INDEXES.items():
+            if field_name in existing:
+                continue
+            await TextDocumentProcessor.qdrant.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=schema,
+            )
+            print(f"[DEBUG] Payload index on '{field_name}' created")
+
+    @staticmethod
+    def _policy_filter(policy_filter: Optional[PolicyFilter]) -> Optional[Filter]:
+        policy_filter = policy_filter or PolicyFilter()
+        conditions = []
+        if policy_filter.country:
+            conditions.append(FieldCondition(key="country", match=MatchValue(value=policy_filter.country)))
+        if policy_filter.policy_type:
+            conditions.append(FieldCondition(key="policy_type", match=MatchValue(value=policy_filter.policy_type)))
+        if policy_filter.statuses:
+            conditions.append(FieldCondition(key="status", match=MatchAny(any=[s.value for s in policy_filter.statuses])))
+        if policy_filter.version is not None:
+            conditions.append(FieldCondition(key="version", match=MatchValue(value=policy_filter.version)))
+        return Filter(must=conditions) if conditions else None
+    @staticmethod
+    def point_id(template_id: str, clause_id: str) -> str:
+        """Deterministic Qdrant point id, so re-indexing a clause overwrites its point"""
+        return str(uuid.uuid5(POINT_ID_NAMESPACE, f"{template_id}:{clause_id}"))
+
+    @staticmethod
+    def content_hash(clause: Clause) -> str:
+        return hashlib.sha256(f"{clause.title}\n{clause.text}".encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _template_payload(template: Template) -> dict:
+        return {
+            "template_id": str(template.id),
+            "country": template.country,
+            "policy_type": template.policy_type,
+            "version": template.version,
+            "status": template.status.value,
+        }
+
+    @staticmethod
+    def _template_filter(template_id: str) -> Filter:
+        return Filter(must=[FieldCondition(key="template_id", match=MatchValue(value=template_id))])
+
+    @staticmethod
+    async def _indexed_hashes(template_id: str) -> Dict[str, Optional[str]]:
+        """point id -> content_hash of every point currently indexed for the template"""
+        indexed: Dict[str, Optional[str]] = {}
+        offset = None
+        while True:
+            points, offset = await TextDocumentProcessor.qdrant.scroll(
+                collection_name=TextDocumentProcessor.collection_name,
+                scroll_filter=TextDocumentProcessor._template_filter(template_id),
+                limit=256,
+                offset=offset,
+                with_payload=["content_hash"],
+                with_vectors=False,
+            )
+            for point in points:
+                indexed[str(point.id)] = (point.payload or {}).get("content_hash")
+            if offset is None:
+                return indexed
+
     @staticmethod
     async def embed_template(template: Template) -> ResponseSchema:
-        if TextDocumentProcessor.qdrant is None or TextDocumentProcessor.gemini_client is None:
+        """
+        Bring the template's points in line with its clauses: new or edited clauses are
+        embedded and upserted, unchanged ones only get their template payload refreshed,
+        and points of removed clauses (or left by older random-id indexing) are deleted.
+        """
+        if TextDocumentProcessor.qdrant is None or TextDocumentProcessor.embedder is None:
             print("[DEBUG] Clients not initialized")
             return ResponseSchema(success=False, message="Clients not initialized", data=None)
 
         try:
+            template_id = str(template.id)
+            template_payload = TextDocumentProcessor._template_payload(template)
+            indexed = await TextDocumentProcessor._indexed_hashes(template_id)
+
             texts: List[str] = []
-            metadata: List[dict] = []
+            changed: List[Tuple[str, dict]] = []
+            unchanged_ids: List[str] = []
+            expected_ids = set()
 
             for clause in template.clauses:
-                text = f"{clause.title}\n{clause.text}"
-                texts.append(text)
-                metadata.append({
-                    "template_id": str(template.id),
-                    "clause_id": clause.clause_id or str(uuid.uuid4()),
+                point_id = TextDocumentProcessor.point_id(template_id, clause.clause_id)
+                expected_ids.add(point_id)
+                content_hash = TextDocumentProcessor.content_hash(clause)
+                if indexed.get(point_id) == content_hash:
+                    unchanged_ids.append(point_id)
+                    continue
+                texts.append(f"{clause.title}\n{clause.text}")
+                changed.append((point_id, {
+                    **template_payload,
+                    "clause_id": clause.clause_id,
                     "title": clause.title,
                     "text": clause.text,
-                    "country": template.country,
-                    "policy_type": template.policy_type,
-                    "version": template.version,
-                    "status": template.status.value
-                })
-
-            print(f"[DEBUG] texts prepared: {texts}")
-            print(f"[DEBUG] metadata prepared: {metadata}")
-
-            vectors: List[List[float]] = []
-            for t in texts:
-                response = TextDocumentProcessor.gemini_client.embed_content(
-                    model=settings.EMBEDDING_MODEL,
-                    content=t
+                    "content_hash": content_hash,
+                }))
+
+            print(f"[DEBUG] template {template_id}: {len(changed)} clauses to embed, {len(unchanged_ids)} unchanged")
+
+            if changed:
+                vectors = await TextDocumentProcessor.embed_texts(texts)
+                points: List[PointStruct] = [
+                    PointStruct(id=point_id, vector=vector, payload=payload)
+                    for (point_id, payload), vector in zip(changed, vectors)
+                ]
+                await TextDocumentProcessor.qdrant.upsert(
+                    collection_name=TextDocumentProcessor.collection_name,
+                    points=points
                 )
-                print(f"[DEBUG] embedding response: {response}")
-                vectors.append(response["embedding"])
+                for (point_id, payload), text in zip(changed, texts):
+                    TextDocumentProcessor.sparse_index.upsert(point_id, text, payload)
 
-            print(f"[DEBUG] vectors computed: {vectors}")
+            if unchanged_ids:
+                await TextDocumentProcessor.qdrant.set_payload(
+                    collection_name=TextDocumentProcessor.collection_name,
+                    payload=template_payload,
+                    points=unchanged_ids,
+                )
+                TextDocumentProcessor.sparse_index.update_payload(unchanged_ids, template_payload)
 
-            points: List[PointStruct] = [
-                PointStruct(
-                    id=str(uuid.uuid4()),  
-                    vector=vectors[i],
-                    payload=metadata[i]   
+            stale_ids = [point_id for point_id in indexed if point_id not in expected_ids]
+            if stale_ids:
+                await TextDocumentProcessor.qdrant.delete(
+                    collection_name=TextDocumentProcessor.collection_name,
+                    points_selector=PointIdsList(points=stale_ids),
                 )
-                for i in range(len(vectors))
-            ]
+                for point_id in stale_ids:
+                    TextDocumentProcessor.sparse_index.remove(point_id)
+
+            print("[DEBUG] Qdrant sync successful")
+            return ResponseSchema(
+                success=True,
+                message="Template embedded successfully",
+                data={
+                    "clauses_count": len(template.clauses),
+                    "embedded": len(changed),
+                    "unchanged": len(unchanged_ids),
+                    "deleted": len(stale_ids),
+                },
+            )
+
+        except Exception as e:
+            print(f"[ERROR] Exception during embedding: {str(e)}")
+            return ResponseSchema(success=False, message=f"Failed to embed template: {str(e)}", data=None)
+
+    @staticmethod
+    async def delete_template(template_id: str) -> ResponseSchema:
+        """Drop every point of the template from the index"""
+        if TextDocumentProcessor.qdrant is None:
+            return ResponseSchema(success=False, message="Clients not initialized", data=None)
+        try:
+            await TextDocumentProcessor.qdrant.delete(
+                collection_name=TextDocumentProcessor.collection_name,
+                points_selector=FilterSelector(filter=TextDocumentProcessor._template_filter(template_id)),
+            )
+            TextDocumentProcessor.sparse_index.remove_where(lambda payload: payload.get("template_id") == template_id)
+            return ResponseSchema(success=True, message="Template points deleted", data=None)
+        except Exception as e:
+            return ResponseSchema(success=False, message=f"Failed to delete template points: {str(e)}", data=None)
+
+    @staticmethod
+    async def embed_texts(texts: List[str]) -> List[List[float]]:
+        """Embed texts with the configured embedder, vectors in input order."""
+        return await TextDocumentProcessor.embedder.embed(texts)
+
+    @staticmethod
+    def _payload_to_clause_response(point_id: str, payload: dict, score: float, rank_score: Optional[float] = None) -> ClauseResponse:
+        return ClauseResponse(
+            clause_id=str(point_id),
+            template_id=str(payload.get("template_id", "")),
+            title=str(payload.get("title", "")),
+            text=str(payload.get("text", "")),
+            score=score,
+            rank_score=rank_score,
+            country=str(payload.get("country", "")),
+            policy_type=str(payload.get("policy_type", "")),
+            version=payload.get("version", 0),
+        )
+
+    @staticmethod
+    def _to_clause_response(point: Any) -> ClauseResponse:
+        return TextDocumentProcessor._payload_to_clause_response(point.id, point.payload or {}, point.score)
+
+    @staticmethod
+    def _matches_policy_filter(payload: dict, policy_filter: Optional[PolicyFilter]) -> bool:
+        """Same conditions as _policy_filter, evaluated on a payload for the sparse index"""
+        policy_filter = policy_filter or PolicyFilter()
+        if policy_filter.country and payload.get("country") != policy_filter.country:
+            return False
+        if policy_filter.policy_type and payload.get("policy_type") != policy_filter.policy_type:
+            return False
+        if policy_filter.statuses and payload.get("status") not in {s.value for s in policy_filter.statuses}:
+            return False
+        if policy_filter.version is not None and payload.get("version") != policy_filter.version:
+            return False
+        return True
+
+    @staticmethod
+    def _hybrid() -> bool:
+        return settings.POLICY_RETRIEVAL_MODE.lower() == "hybrid" and len(TextDocumentProcessor.sparse_index) > 0
+
+    @staticmethod
+    def _sparse_search(text: str, limit: int, policy_filter: Optional[PolicyFilter]) -> List[Tuple[str, float]]:
+        return TextDocumentProcessor.sparse_index.search(
+            text,
+            limit,
+            predicate=lambda payload: TextDocumentProcessor._matches_policy_filter(payload, policy_filter),
+        )
+
+    @staticmethod
+    def _fuse(dense_hits: List[Any], sparse_hits: List[Tuple[str, float]], top_k: int) -> List[ClauseResponse]:
+        """
+        Reciprocal rank fusion of dense and BM25 results. score stays the dense
+        similarity (0.0 for keyword-only matches); rank_score is the fused score.
+        """
+        dense_by_id = {str(hit.id): hit for hit in dense_hits}
+        fused = reciprocal_rank_fusion(
+            [list(dense_by_id), [doc_id for doc_id, _ in sparse_hits]],
+            k=settings.HYBRID_RRF_K,
+        )
+        results: List[ClauseResponse] = []
+        for doc_id, rank_score in fused[:top_k]:
+            hit = dense_by_id.get(doc_id)
+            if hit is not None:
+                payload, score = hit.payload or {}, hit.score
+            else:
+                payload, score = TextDocumentProcessor.sparse_index.payload(doc_id) or {}, 0.0
+            results.append(TextDocumentProcessor._payload_to_clause_response(doc_id, payload, score, rank_score))
+        return results
 
-            print(f"[DEBUG] points to upsert: {points}")
+    @staticmethod
+    async def retrieve_policies_batch(
+        document_texts: List[str],
+        top_k: int = 5,
+        policy_filter: Optional[PolicyFilter] = None,
+    ) -> ResponseSchema:
+        """
+        Top-k policy clauses for each text: the texts are embedded in batches and
+        searched with a single Qdrant batch request, fused with BM25 matches in hybrid
+        mode. data[i] holds the hits for document_texts[i].
+        """
+        if TextDocumentProcessor.qdrant is None or TextDocumentProcessor.embedder is None:
+            return ResponseSchema(success=False, message="Clients not initialized", data=None)
+        if not document_texts:
+            return ResponseSchema(success=True, message="Policies retrieved successfully", data=[])
+
+        try:
+            hybrid = TextDocumentProcessor._hybrid()
+            candidates = top_k * settings.HYBRID_CANDIDATES_FACTOR if hybrid else top_k
+            query_vectors = await TextDocumentProcessor.embed_texts(document_texts)
+            query_filter = TextDocumentProcessor._policy_filter(policy_filter)
+            search_params = TextDocumentProcessor.search_params()
 
-            await TextDocumentProcessor.qdrant.upsert(
+            results = await TextDocumentProcessor.qdrant.search_batch(
                 collection_name=TextDocumentProcessor.collection_name,
-                points=points
+                requests=[
+                    SearchRequest(vector=vector, filter=query_filter, limit=candidates, params=search_params, with_payload=True)
+                    for vector in query_vectors
+                ],
             )
 
-            print("[DEBUG] Qdrant upsert successful")
-            return ResponseSchema(success=True, message="Template embedded successfully", data={"clauses_count": len(points)})
+            if hybrid:
+                formatted: List[List[ClauseResponse]] = [
+                    TextDocumentProcessor._fuse(hits, TextDocumentProcessor._sparse_search(text, candidates, policy_filter), top_k)
+                    for text, hits in zip(document_texts, results)
+                ]
+            else:
+                formatted = [
+                    [TextDocumentProcessor._to_clause_response(r) for r in hits]
+                    for hits in results
+                ]
+            return ResponseSchema(success=True, message="Policies retrieved successfully", data=formatted)
 
         except Exception as e:
-            print(f"[ERROR] Exception during embedding: {str(e)}")
-            return ResponseSchema(success=False, message=f"Failed to embed template: {str(e)}", data=None)
+            return ResponseSchema(success=False, message=f"Failed to retrieve policies: {str(e)}", data=None)
+
     @staticmethod
-    async def retrieve_policies(document_text: str, top_k: int = 5) -> ResponseSchema:
-        """Search Qdrant for clauses similar to the input text."""
-        if TextDocumentProcessor.qdrant is None or TextDocumentProcessor.gemini_client is None:
+    async def retrieve_policies(
+        document_text: str,
+        top_k: int = 5,
+        policy_filter: Optional[PolicyFilter] = None,
+    ) -> ResponseSchema:
+        """
+        Search for clauses similar to the input text, among active templates unless filtered
+        otherwise. Short keyword queries ("force majeure", "GDPR art. 28") that match the
+        BM25 index are answered from it alone, without an embedding call.
+        """
+        if TextDocumentProcessor.qdrant is None or TextDocumentProcessor.embedder is None:
             return ResponseSchema(success=False, message="Clients not initialized", data=None)
 
         try:
-            query_vector: List[float] = TextDocumentProcessor.gemini_client.embed_content(
-                model=settings.EMBEDDING_MODEL,
-                content=document_text
-            )["embedding"]
+            hybrid = TextDocumentProcessor._hybrid()
+            candidates = top_k * settings.HYBRID_CANDIDATES_FACTOR if hybrid else top_k
+            sparse_hits: List[Tuple[str, float]] = []
+            if hybrid:
+                sparse_hits = TextDocumentProcessor._sparse_search(document_text, candidates, policy_filter)
+                words = [t for t in tokenize(document_text) if "_" not in t]
+                if sparse_hits and len(words) <= settings.SPARSE_FAST_PATH_MAX_TERMS:
+                    formatted = [
+                        TextDocumentProcessor._payload_to_clause_response(
+                            doc_id, TextDocumentProcessor.sparse_index.payload(doc_id) or {}, 0.0, bm25_score
+                        )
+                        for doc_id, bm25_score in sparse_hits[:top_k]
+                    ]
+                    return ResponseSchema(success=True, message="Policies retrieved successfully", data=formatted)
+
+            query_vector: List[float] = (await TextDocumentProcessor.embed_texts([document_text]))[0]
 
             results = await TextDocumentProcessor.qdrant.search(
                 collection_name=TextDocumentProcessor.collection_name,
                 query_vector=query_vector,
-                limit=top_k
+                query_filter=TextDocumentProcessor._policy_filter(policy_filter),
+                search_params=TextDocumentProcessor.search_params(),
+                limit=candidates
             )
 
-            formatted: List[ClauseResponse] = [
-                ClauseResponse(
-                    clause_id=str(r.id),
-                    template_id=str(r.payload.get("template_id", "")),
-                    title=str(r.payload.get("title", "")),
-                    text=str(r.payload.get("text", "")),
-                    score=str(r.score),
-                    country=str(r.payload.get("country", "")),
-                    policy_type=str(r.payload.get("policy_type", "")),
-                    version=str(r.payload.get("version", "")),
-                )
-                for r in results
-            ]
+            if hybrid:
+                formatted = TextDocumentProcessor._fuse(results, sparse_hits, top_k)
+            else:
+                formatted = [
+                    TextDocumentProcessor._to_clause_response(r)
+                    for r in results
+                ]
 
             return ResponseSchema(success=True, message="Policies retrieved successfully", data=formatted)
 
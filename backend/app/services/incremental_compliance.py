@@ -0,0 +1,212 @@
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+from app.config import settings
+from app.models.compliance import ClauseFindingRecord
+from app.repositories.compliance import ComplianceFindingRepository
+from app.repositories.policy import TemplateRepository
+from app.services.compliance_check import (
+    SPECIALIST_AGENTS,
+    ClauseWithCompliance,
+    ComplianceCheckResult,
+    _build_compliance_result,
+    _ensure_unique_finding_ids,
+    _run_specialists,
+)
+
+
+def clause_hash(clause: ClauseWithCompliance) -> str:
+    """Stable hash of a clause's heading and text, insensitive to case and whitespace"""
+    normalized = " ".join(f"{clause.heading or ''}\n{clause.text}".lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _contract_scope(contract_id: str) -> str:
+    return f"contract:{contract_id}"
+
+
+def _finding_clause_ids(finding: Dict) -> List[str]:
+    return [str(c.get("clause_id")) for c in finding.get("affected_clauses") or [] if isinstance(c, dict)]
+
+
+def _split_findings(findings: List[Dict], clause_ids: set) -> Tuple[Dict[str, List[Dict]], List[Dict]]:
+    """
+    Attribute each finding to the evaluated clauses it affects. A copy is kept per clause,
+    restricted to that clause, so it can be reused on its own later. Findings that
+    reference none of the evaluated clauses are contract-level.
+    """
+    per_clause: Dict[str, List[Dict]] = {}
+    contract_level: List[Dict] = []
+    for finding in findings:
+        affected = [cid for cid in _finding_clause_ids(finding) if cid in clause_ids]
+        if not affected:
+            contract_level.append(finding)
+            continue
+        for cid in affected:
+            per_clause.setdefault(cid, []).append({
+                **finding,
+                "affected_clauses": [
+                    c for c in finding["affected_clauses"]
+                    if isinstance(c, dict) and str(c.get("clause_id")) == cid
+                ],
+            })
+    return per_clause, contract_level
+
+
+def _reusable(record: ClauseFindingRecord, prescreen: bool) -> bool:
+    """
+    A pre-screen skip only stands for a call that pre-screens at least as leniently:
+    the clause's risk was below the recorded threshold, so it is below any higher one.
+    """
+    if not record.prescreened:
+        return True
+    return prescreen and settings.COMPLIANCE_PRESCREEN_THRESHOLD >= (record.prescreen_threshold or 0.0)
+
+
+def _finding_key(finding: Dict) -> Tuple[str, str]:
+    return (str(finding.get("finding_id", "")), re.sub(r"\s+", " ", str(finding.get("title", ""))).strip().lower())
+
+
+def _merge_clause_findings(findings: List[Tuple[Dict, str]]) -> List[Dict]:
+    """
+    Rebuild findings from per-clause copies, pointing them at the clause ids
+    of the current contract and joining copies of the same finding.
+    """
+    merged: Dict[Tuple[str, str], Dict] = {}
+    for finding, current_clause_id in findings:
+        affected = [{**c, "clause_id": current_clause_id} for c in finding.get("affected_clauses") or []]
+        key = _finding_key(finding)
+        if key in merged:
+            known = {c["clause_id"] for c in merged[key]["affected_clauses"]}
+            merged[key]["affected_clauses"].extend(c for c in affected if c["clause_id"] not in known)
+        else:
+            merged[key] = {**finding, "affected_clauses": affected}
+    return list(merged.values())
+
+
+async def check_compliance_incremental(
+    clauses: List[ClauseWithCompliance],
+    contract_id: str,
+    timeout: Optional[float] = None,
+    fan_out: Optional[bool] = None,
+    full: bool = False,
+    prescreen: Optional[bool] = None,
+) -> ComplianceCheckResult:
+    """
+    Compliance check that only sends new or changed clauses to the agents.
+
+    Findings are stored per (contract, clause hash, policy-collection version, agent); clauses
+    whose text is unchanged since the contract's previous check against the same policies
+    reuse their stored findings. Records are not shared between contracts. Contract-level findings from earlier runs are carried over and
+    merged with the new ones unless every clause was re-evaluated. Specialists skipped by
+    the pre-screen store empty records marked prescreened; they are only reused by calls
+    that pre-screen with the same or a higher threshold.
+    """
+    timeout = settings.COMPLIANCE_CHECK_TIMEOUT if timeout is None else timeout
+    fan_out = settings.COMPLIANCE_FAN_OUT if fan_out is None else fan_out
+    prescreen = settings.COMPLIANCE_PRESCREEN_ENABLED if prescreen is None else prescreen
+
+    policy_version = await TemplateRepository.get_policy_version(settings.QDRANT_COLLECTION)
+    hashes = {c.clause_id: clause_hash(c) for c in clauses}
+    scope = _contract_scope(contract_id)
+
+    records = await ComplianceFindingRepository.get_for_hashes(contract_id, [*hashes.values(), scope], policy_version)
+    cached: Dict[Tuple[str, str], ClauseFindingRecord] = {
+        (r.clause_hash, r.source): r for r in records if _reusable(r, prescreen)
+    }
+
+    sources = [source.value for source in SPECIALIST_AGENTS]
+    if full:
+        pending = list(clauses)
+    else:
+        pending = [c for c in clauses if any((hashes[c.clause_id], s) not in cached for s in sources)]
+    print(f"Incremental compliance check for contract {contract_id}: {len(pending)} of {len(clauses)} clauses to evaluate")
+
+    results, failures, skipped = {}, {}, set()
+    if pending:
+        results, failures, skipped = await _run_specialists(
+            pending, contract_id, timeout, fan_out,
+            outline=clauses if len(pending) < len(clauses) else None,
+            prescreen=prescreen,
+        )
+
+    pending_ids = {c.clause_id for c in pending}
+    new_records: List[ClauseFindingRecord] = []
+    for source in skipped:
+        for clause in pending:
+            record = ClauseFindingRecord(
+                contract_id=contract_id,
+                clause_hash=hashes[clause.clause_id],
+                policy_version=policy_version,
+                source=source.value,
+                clause_id=clause.clause_id,
+                findings=[],
+                prescreened=True,
+                prescreen_threshold=settings.COMPLIANCE_PRESCREEN_THRESHOLD,
+            )
+            cached[(record.clause_hash, record.source)] = record
+            new_records.append(record)
+    for source, result in results.items():
+        per_clause, contract_level = _split_findings(result["findings"], pending_ids)
+        for clause in pending:
+            record = ClauseFindingRecord(
+                contract_id=contract_id,
+                clause_hash=hashes[clause.clause_id],
+                policy_version=policy_version,
+                source=source.value,
+                clause_id=clause.clause_id,
+                findings=per_clause.get(clause.clause_id, []),
+                compliance_score=result["clause_scores"].get(clause.clause_id),
+            )
+            cached[(record.clause_hash, record.source)] = record
+            new_records.append(record)
+
+        previous = cached.get((scope, source.value))
+        if previous is not None and len(pending) < len(clauses):
+            new_keys = {_finding_key(f) for f in contract_level}
+            contract_level = contract_level + [f for f in previous.findings if _finding_key(f) not in new_keys]
+        record = ClauseFindingRecord(
+            contract_id=contract_id,
+            clause_hash=scope,
+            policy_version=policy_version,
+            source=source.value,
+            clause_id="",
+            findings=contract_level,
+        )
+        cached[(scope, source.value)] = record
+        new_records.append(record)
+
+    await ComplianceFindingRepository.save_many(contract_id, policy_version, new_records)
+
+    agents_used = []
+    skipped_agents = []
+    all_findings = []
+    scores = []
+    for source in SPECIALIST_AGENTS:
+        clause_findings: List[Tuple[Dict, str]] = []
+        clause_scores = []
+        has_records = False
+        for clause in clauses:
+            record = cached.get((hashes[clause.clause_id], source.value))
+            if record is None:
+                continue
+            has_records = True
+            clause_findings.extend((f, clause.clause_id) for f in record.findings)
+            if record.compliance_score is not None:
+                clause_scores.append(record.compliance_score)
+        contract_record = cached.get((scope, source.value))
+        source_findings = _merge_clause_findings(clause_findings) + (contract_record.findings if contract_record else [])
+
+        if not clause_scores and not source_findings:
+            # Only pre-screen records: the specialist was never needed
+            if has_records and source not in failures:
+                skipped_agents.append(source)
+            continue
+        all_findings.extend(_ensure_unique_finding_ids(source_findings))
+        scores.append(sum(clause_scores) / len(clause_scores) if clause_scores else 1.0)
+        agents_used.append(source)
+
+    result = _build_compliance_result(all_findings, scores, agents_used, contract_id, failed_agents=list(failures), skipped_agents=skipped_agents)
+    result.clauses_evaluated = len(pending)
+    result.clauses_reused = len(clauses) - len(pending)
+    return result
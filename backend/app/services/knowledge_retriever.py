@@ -0,0 +1,33 @@
+from typing import List
+from app.config import settings
+from app.dto.policy import ClauseResponse, PolicyFilter
+from app.services.embedding import TextDocumentProcessor
+
+
+def format_policies(policies: List[ClauseResponse]) -> str:
+    if not policies:
+        return "No matching company policies were found."
+    return "\n\n".join(
+        f"[Policy {p.template_id}/{p.clause_id}] {p.title or 'Untitled'} (type: {p.policy_type or 'n/a'}, country: {p.country or 'n/a'}, version: {p.version})\n{p.text}"
+        for p in policies
+    )
+
+
+async def search_company_policies(query: str) -> str:
+    """
+    Search the company policy library for the active policy clauses most relevant to the query.
+
+    Args:
+        query: A clause excerpt or the legal/financial terms to look up.
+
+    Returns:
+        The best matching policy clauses with their template, type, country and version.
+    """
+    response = await TextDocumentProcessor.retrieve_policies(
+        query,
+        top_k=settings.AGENT_POLICY_SEARCH_TOP_K,
+        policy_filter=PolicyFilter(country=settings.COMPLIANCE_POLICY_COUNTRY),
+    )
+    if not response.success:
+        return f"Policy search failed: {response.message}"
+    return format_policies(response.data)
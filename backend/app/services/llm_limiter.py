@@ -0,0 +1,248 @@
+import asyncio
+import heapq
+import itertools
+import time
+import weakref
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Dict, List, Optional, Tuple
+from agno.agent import Agent
+from app.config import settings
+
+
+class LLMPriority(IntEnum):
+    """Lanes for outbound LLM calls, lower values are served first"""
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+class TokenBucket:
+    """Classic token bucket; the level may go negative to impose a cool-down"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.level = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be taken, 0 if it is available now"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.refill_per_second
+
+    def take(self, amount: float) -> None:
+        self._refill()
+        self.level -= min(amount, self.capacity)
+
+    def block_for(self, seconds: float) -> None:
+        self._refill()
+        self.level = min(self.level, -seconds * self.refill_per_second)
+
+
+class LLMRateLimiter:
+    """
+    Client-side limiter shared by every outbound LLM call.
+
+    Callers wait in a priority queue until a concurrency slot, one request from the
+    requests-per-minute bucket and their estimated tokens from the tokens-per-minute
+    bucket are available. Interactive callers are always served before batch ones.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, max_concurrency: int):
+        self._requests = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self._tokens = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+        self._max_concurrency = max_concurrency
+        self._in_flight = 0
+        self._queue: List[Tuple[int, int, asyncio.Future, float]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._granted = {priority: 0 for priority in LLMPriority}
+        self._total_wait = {priority: 0.0 for priority in LLMPriority}
+        self._max_wait = {priority: 0.0 for priority in LLMPriority}
+        self._throttled = 0
+
+    async def acquire(self, estimated_tokens: int, priority: LLMPriority = LLMPriority.BATCH) -> None:
+        future = asyncio.get_running_loop().create_future()
+        queued_at = time.monotonic()
+        heapq.heappush(self._queue, (int(priority), next(self._sequence), future, float(estimated_tokens)))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted right before the caller was cancelled: hand the slot back
+            if future.done() and not future.cancelled():
+                self.release()
+            else:
+                self._dispatch()
+            raise
+        waited = time.monotonic() - queued_at
+        self._granted[priority] += 1
+        self._total_wait[priority] += waited
+        self._max_wait[priority] = max(self._max_wait[priority], waited)
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, estimated_tokens: int, priority: LLMPriority = LLMPriority.BATCH):
+        await self.acquire(estimated_tokens, priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def report_throttled(self, retry_after: float) -> None:
+        """The provider answered 429: stop granting requests until it has cooled down"""
+        self._throttled += 1
+        self._requests.block_for(retry_after)
+        print(f"[WARNING] LLM provider rate limit hit, pausing outbound calls for {retry_after:.1f}s")
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._queue:
+            _, _, future, tokens = self._queue[0]
+            if future.done():
+                heapq.heappop(self._queue)
+                continue
+            if self._in_flight >= self._max_concurrency:
+                return
+            wait = max(self._requests.wait_time(1), self._tokens.wait_time(tokens))
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._queue)
+            self._requests.take(1)
+            self._tokens.take(tokens)
+            self._in_flight += 1
+            future.set_result(None)
+
+    def metrics(self) -> Dict[str, Any]:
+        queue_depth = {priority.name.lower(): 0 for priority in LLMPriority}
+        for priority, _, future, _ in self._queue:
+            if not future.done():
+                queue_depth[LLMPriority(priority).name.lower()] += 1
+        return {
+            "queue_depth": queue_depth,
+            "in_flight": self._in_flight,
+            "max_concurrency": self._max_concurrency,
+            "granted": {p.name.lower(): n for p, n in self._granted.items()},
+            "avg_wait_seconds": {
+                p.name.lower(): (self._total_wait[p] / self._granted[p]) if self._granted[p] else 0.0
+                for p in LLMPriority
+            },
+            "max_wait_seconds": {p.name.lower(): w for p, w in self._max_wait.items()},
+            "throttled_by_provider": self._throttled,
+            "requests_available": max(0.0, self._requests.level),
+            "tokens_available": max(0.0, self._tokens.level),
+        }
+
+
+# Queued futures and refill timers belong to one event loop, so each loop gets its own
+# limiter (the API server runs in one; scripts calling asyncio.run get a fresh one each time)
+_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LLMRateLimiter]" = weakref.WeakKeyDictionary()
+
+
+def get_llm_limiter() -> LLMRateLimiter:
+    """The limiter shared by every outbound LLM call made from the running event loop"""
+    loop = asyncio.get_running_loop()
+    limiter = _limiters.get(loop)
+    if limiter is None:
+        limiter = _limiters[loop] = LLMRateLimiter(
+            requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.LLM_TOKENS_PER_MINUTE,
+            max_concurrency=settings.LLM_MAX_CONCURRENT_REQUESTS,
+        )
+    return limiter
+
+
+def estimate_tokens(prompt: str) -> int:
+    """Rough budget for one call: ~4 characters per prompt token plus the completion limit"""
+    return len(prompt) // 4 + settings.LLM_MAX_TOKENS
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    message = str(exc).lower()
+    return status == 429 or "rate limit" in message or "too many requests" in message
+
+
+def _retry_after(exc: BaseException) -> float:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return float(settings.LLM_RATE_LIMIT_BACKOFF)
+
+
+# Lane of the run_agent call in progress, None outside run_agent
+_current_priority: ContextVar[Optional[LLMPriority]] = ContextVar("llm_priority", default=None)
+
+
+def _estimate_call(args: tuple, kwargs: dict) -> int:
+    messages = kwargs.get("messages", args[0] if args else None) or []
+    return estimate_tokens("".join(str(getattr(m, "content", None) or "") for m in messages))
+
+
+def limit_model_calls(model: Any, priority: LLMPriority = LLMPriority.BATCH) -> None:
+    """
+    Route every provider call of `model`, streamed or not, through the shared limiter.
+    A tool-using agent calls the model once per tool round, so each of those calls takes
+    its own request and token budget. `priority` applies to calls made outside run_agent,
+    e.g. by agents served through AgentOS.
+    """
+    if model is None or getattr(model, "_rate_limited", False):
+        return
+    invoke, invoke_stream = model.ainvoke, getattr(model, "ainvoke_stream", None)
+
+    def lane() -> LLMPriority:
+        current = _current_priority.get()
+        return priority if current is None else current
+
+    async def ainvoke(*args, **kwargs):
+        limiter = get_llm_limiter()
+        async with limiter.slot(_estimate_call(args, kwargs), lane()):
+            try:
+                return await invoke(*args, **kwargs)
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    limiter.report_throttled(_retry_after(e))
+                raise
+
+    async def ainvoke_stream(*args, **kwargs):
+        limiter = get_llm_limiter()
+        async with limiter.slot(_estimate_call(args, kwargs), lane()):
+            try:
+                async for chunk in invoke_stream(*args, **kwargs):
+                    yield chunk
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    limiter.report_throttled(_retry_after(e))
+                raise
+
+    model.ainvoke = ainvoke
+    if invoke_stream is not None:
+        model.ainvoke_stream = ainvoke_stream
+    model._rate_limited = True
+
+
+async def run_agent(agent: Agent, prompt: str, priority: LLMPriority = LLMPriority.BATCH, **kwargs) -> Any:
+    """Run an agent with each of its model calls going through the shared limiter"""
+    limit_model_calls(agent.model)
+    token = _current_priority.set(priority)
+    try:
+        return await agent.arun(prompt, **kwargs)
+    finally:
+        _current_priority.reset(token)
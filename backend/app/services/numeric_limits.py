@@ -0,0 +1,245 @@
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.config import settings
+from app.dto.policy import NumericLimitViolation
+
+
+KINDS = ("money", "percent", "duration")
+
+CURRENCY_ALIASES = {
+    "qar": "QAR", "qr": "QAR", "riyal": "QAR", "riyals": "QAR", "rial": "QAR", "rials": "QAR", "ر.ق": "QAR",
+    "usd": "USD", "us$": "USD", "$": "USD", "dollar": "USD", "dollars": "USD",
+    "eur": "EUR", "€": "EUR", "euro": "EUR", "euros": "EUR",
+    "gbp": "GBP", "£": "GBP", "pound": "GBP", "pounds": "GBP",
+    "sar": "SAR", "aed": "AED",
+}
+
+MULTIPLIERS = {"k": 1e3, "thousand": 1e3, "m": 1e6, "mn": 1e6, "million": 1e6, "bn": 1e9, "billion": 1e9}
+
+DAYS_PER_UNIT = {"day": 1, "week": 7, "month": 30, "year": 365}
+
+# numeric_limits key tokens that set the kind of a limit
+PERCENT_TOKENS = {"percent", "percentage", "pct", "rate"}
+DURATION_TOKENS = {"period", "notice", "duration", "term"}
+# Key tokens that say nothing about where in the clause the value is stated
+GENERIC_TOKENS = {"min", "minimum", "max", "maximum", "percent", "percentage", "pct", "amount", "value"} | {
+    f"{unit}{s}" for unit in DAYS_PER_UNIT for s in ("", "s")
+}
+# Extra clause words that introduce the value of a limit key token
+KEYWORD_ALIASES = {
+    "cap": ("liabilit", "aggregate", "exceed"),
+    "fee": ("charge", "price"),
+    "penalty": ("late", "interest"),
+    "notice": ("prior",),
+}
+
+_NUM = r"(?P<num>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)"
+_MULT = r"(?:\s*(?P<mult>thousand|million|billion|mn|bn|k|m)\b)?"
+# Codes may touch the amount ("QR500", "500QAR") but not other letters
+_CUR = r"(?P<cur>US\$|\$|€|£|ر\.ق|(?<![a-z])(?:QAR|QR|USD|EUR|GBP|SAR|AED|riyals?|rials?|dollars?|euros?|pounds?)(?![a-z]))"
+
+_MONEY_PREFIX_RE = re.compile(_CUR + r"\s*" + _NUM + _MULT, re.IGNORECASE)
+_MONEY_SUFFIX_RE = re.compile(_NUM + _MULT + r"\s*" + _CUR, re.IGNORECASE)
+_PERCENT_RE = re.compile(_NUM + r"\s*(?:%|percent\b|per\s*-?\s*cent\b)", re.IGNORECASE)
+# "thirty (30) days", "30-day notice", "6 calendar months", "2 years"
+_DURATION_RE = re.compile(
+    _NUM + r"\s*\)?[\s\-]*(?:business\s+|working\s+|calendar\s+)?(?P<unit>day|week|month|year)s?\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class ExtractedValue:
+    kind: str  # "money" (in NUMERIC_BASE_CURRENCY), "percent" or "duration" (in days)
+    value: float
+    raw: str
+    currency: Optional[str] = None
+    start: int = 0  # offset of the value in the clause text
+
+
+def _to_number(num: str, mult: Optional[str]) -> float:
+    return float(num.replace(",", "")) * MULTIPLIERS.get((mult or "").lower(), 1.0)
+
+
+def to_base_currency(amount: float, currency: str) -> Optional[float]:
+    """Amount converted to NUMERIC_BASE_CURRENCY, None for a currency without a configured rate"""
+    rates = settings.CURRENCY_RATES_TO_QAR
+    if currency not in rates or settings.NUMERIC_BASE_CURRENCY not in rates:
+        return None
+    return amount * rates[currency] / rates[settings.NUMERIC_BASE_CURRENCY]
+
+
+def extract_values(text: str) -> List[ExtractedValue]:
+    """
+    Monetary amounts (normalised to NUMERIC_BASE_CURRENCY), percentages and durations
+    (in days) found in a clause. Bare numbers without a currency or unit are ignored.
+    """
+    values: List[ExtractedValue] = []
+    taken: List[Tuple[int, int]] = []
+
+    def free(span: Tuple[int, int]) -> bool:
+        return all(span[1] <= start or span[0] >= end for start, end in taken)
+
+    for pattern in (_MONEY_PREFIX_RE, _MONEY_SUFFIX_RE):
+        for match in pattern.finditer(text):
+            if not free(match.span()):
+                continue
+            currency = CURRENCY_ALIASES.get(match.group("cur").lower())
+            amount = to_base_currency(_to_number(match.group("num"), match.group("mult")), currency)
+            if amount is None:
+                continue
+            taken.append(match.span())
+            values.append(ExtractedValue("money", amount, match.group(0), currency, match.start()))
+
+    for match in _PERCENT_RE.finditer(text):
+        if free(match.span()):
+            taken.append(match.span())
+            values.append(ExtractedValue("percent", _to_number(match.group("num"), None), match.group(0), start=match.start()))
+
+    for match in _DURATION_RE.finditer(text):
+        if free(match.span()):
+            taken.append(match.span())
+            days = _to_number(match.group("num"), None) * DAYS_PER_UNIT[match.group("unit").lower()]
+            values.append(ExtractedValue("duration", days, match.group(0), start=match.start()))
+    return values
+
+
+def limit_spec(key: str, limit: float) -> Tuple[str, str, float]:
+    """
+    (kind, bound, limit in base units) implied by a numeric_limits key, e.g.
+    "cap" -> money max, "min_fee" -> money min, "penalty_percent" -> percent max,
+    "notice_period_months" -> duration max in days. The key is read as "_"-separated
+    tokens, so "monthly_fee_cap" stays money. Keys are upper bounds unless they
+    contain a "min"/"minimum" token.
+    """
+    tokens = set(key.lower().split("_"))
+    bound = "min" if tokens & {"min", "minimum"} else "max"
+    if tokens & PERCENT_TOKENS:
+        return "percent", bound, float(limit)
+    for unit, days in DAYS_PER_UNIT.items():
+        if tokens & {unit, f"{unit}s"}:
+            return "duration", bound, float(limit) * days
+    if tokens & DURATION_TOKENS:
+        return "duration", bound, float(limit)
+    return "money", bound, float(limit)
+
+
+def _stem(token: str) -> str:
+    return token if len(token) <= 4 else token[:-1]
+
+
+def _keyword_positions(key: str, text: str) -> List[int]:
+    """Offsets of the words in the clause that name the limit, e.g. "fee"/"fees" for "min_fee" """
+    stems = set()
+    for token in key.lower().split("_"):
+        if token and token not in GENERIC_TOKENS:
+            stems.add(_stem(token))
+            stems.update(KEYWORD_ALIASES.get(token, ()))
+    if not stems:
+        return []
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(s) for s in sorted(stems)) + r")\w*", re.IGNORECASE)
+    return [m.start() for m in pattern.finditer(text)]
+
+
+def _nearest_value(key: str, kind: str, text: str, values: List[ExtractedValue]) -> Tuple[bool, Optional[ExtractedValue]]:
+    """
+    (whether the clause names the limit, the value of `kind` stated closest to such a word).
+    When it is not named the caller falls back to the largest/smallest value of the kind.
+    """
+    positions = _keyword_positions(key, text)
+    candidates = [v for v in values if v.kind == kind]
+    if not positions or not candidates:
+        return bool(positions), None
+    return True, min(candidates, key=lambda v: min(abs(v.start - p) for p in positions))
+
+
+@dataclass
+class NumericCheck:
+    """One contract clause paired with the numeric_limits of the template clause it matched"""
+    contract_id: str
+    clause_id: str
+    text: str
+    template_id: str
+    template_clause_id: str
+    numeric_limits: Dict[str, float]
+
+
+def validate_numeric_limits(checks: List[NumericCheck]) -> List[NumericLimitViolation]:
+    """
+    Compare extracted values against template limits for any number of clause pairs at once.
+    Each limit is paired with the value of its kind stated nearest a word naming it (e.g.
+    the amount next to "fee" for min_fee). When the clause never names the limit, a max
+    limit is checked against the largest value of its kind and a min limit against the
+    smallest. Clauses with no value of the limit's kind are not flagged.
+    """
+    if not checks:
+        return []
+    kind_index = {kind: i for i, kind in enumerate(KINDS)}
+
+    extracted = [extract_values(c.text) for c in checks]
+    value_rows = [(i, kind_index[v.kind], v.value) for i, values in enumerate(extracted) for v in values]
+
+    # Per (kind, clause pair): the largest and smallest extracted value, NaN when none
+    observed_max = np.full((len(KINDS), len(checks)), np.nan)
+    observed_min = np.full((len(KINDS), len(checks)), np.nan)
+    if value_rows:
+        rows = np.asarray(value_rows, dtype=np.float64)
+        pair_idx = rows[:, 0].astype(np.intp)
+        kind_idx = rows[:, 1].astype(np.intp)
+        np.fmax.at(observed_max, (kind_idx, pair_idx), rows[:, 2])
+        np.fmin.at(observed_min, (kind_idx, pair_idx), rows[:, 2])
+
+    limit_rows = []
+    paired: List[Optional[ExtractedValue]] = []
+    by_keyword: List[bool] = []
+    for i, check in enumerate(checks):
+        for key, limit in (check.numeric_limits or {}).items():
+            if limit is None:
+                continue
+            kind, bound, base_limit = limit_spec(key, limit)
+            limit_rows.append((i, key, kind, bound, base_limit))
+            named, nearest = _nearest_value(key, kind, check.text, extracted[i])
+            by_keyword.append(named)
+            paired.append(nearest)
+    if not limit_rows:
+        return []
+
+    pair = np.fromiter((r[0] for r in limit_rows), dtype=np.intp, count=len(limit_rows))
+    kind = np.fromiter((kind_index[r[2]] for r in limit_rows), dtype=np.intp, count=len(limit_rows))
+    is_min = np.fromiter((r[3] == "min" for r in limit_rows), dtype=bool, count=len(limit_rows))
+    limits = np.fromiter((r[4] for r in limit_rows), dtype=np.float64, count=len(limit_rows))
+
+    keyword_rows = np.asarray(by_keyword, dtype=bool)
+    keyword_values = np.fromiter(
+        (v.value if v is not None else np.nan for v in paired), dtype=np.float64, count=len(limit_rows)
+    )
+    extreme = np.where(is_min, observed_min[kind, pair], observed_max[kind, pair])
+    observed = np.where(keyword_rows, keyword_values, extreme)
+    with np.errstate(invalid="ignore"):
+        violated = np.where(is_min, observed < limits, observed > limits) & ~np.isnan(observed)
+
+    violations = []
+    for row in np.flatnonzero(violated):
+        i, key, kind_name, bound, base_limit = limit_rows[row]
+        check = checks[i]
+        value = float(observed[row])
+        if by_keyword[row]:
+            raw = paired[row].raw
+        else:
+            raw = next((v.raw for v in extracted[i] if v.kind == kind_name and v.value == value), None)
+        violations.append(NumericLimitViolation(
+            contract_id=check.contract_id,
+            clause_id=check.clause_id,
+            template_id=check.template_id,
+            template_clause_id=check.template_clause_id,
+            limit_key=key,
+            kind=kind_name,
+            bound=bound,
+            limit=base_limit,
+            observed=value,
+            raw=raw,
+            matched_by="keyword" if by_keyword[row] else "extreme",
+        ))
+    return violations
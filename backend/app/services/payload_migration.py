@@ -0,0 +1,70 @@
+import asyncio
+from typing import Dict
+from beanie import init_beanie
+from pymongo import AsyncMongoClient
+from app.config import settings
+from app.minio import init_minio_client
+from app.models.documentUploaded import ContractDocument, ContractPayload, PayloadKind
+from app.repositories.contract import ContractRepository
+from app.repositories.contract_payload import ContractPayloadRepository
+
+
+async def migrate_contract_payloads(batch_size: int = 100) -> Dict[str, int]:
+    """
+    Backfill for the split storage layout: move content, clauses and risks still
+    stored inline on contracts records into contract_payloads. Safe to re-run;
+    contracts read before the backfill are migrated lazily on first access.
+    """
+    collection = ContractDocument.get_pymongo_collection()
+    inline = {"$or": [{kind.value: {"$exists": True}} for kind in PayloadKind]}
+    migrated = 0
+    while True:
+        ids = [d["_id"] async for d in collection.find(inline, projection={"_id": 1}).limit(batch_size)]
+        if not ids:
+            break
+        for contract_id in ids:
+            await ContractRepository.migrate_inline_payloads(contract_id)
+        migrated += len(ids)
+        print(f"[DEBUG] Moved payloads of {migrated} contracts")
+    return {"migrated": migrated, "remaining": await collection.count_documents(inline)}
+
+
+async def compress_contract_payloads() -> Dict[str, int]:
+    """
+    Backfill for payload compression: rewrite payloads whose stored form does not
+    match the current settings (large plain JSON, or gzip blobs) as zstd. Safe to re-run.
+    """
+    collection = ContractPayload.get_pymongo_collection()
+    candidates = {"size_bytes": {"$gte": settings.CONTRACT_PAYLOAD_COMPRESS_MIN_BYTES}, "codec": {"$ne": "zstd"}}
+    stored_before = 0
+    rewritten = 0
+    cursor = collection.find(candidates, projection={"_id": 1})
+    async for entry in cursor:
+        document = await collection.find_one({"_id": entry["_id"]})
+        if document is None:
+            continue
+        stored_before += document["size_bytes"]
+        if await ContractPayloadRepository.recompress(document):
+            rewritten += 1
+            if rewritten % 100 == 0:
+                print(f"[DEBUG] Compressed {rewritten} contract payloads")
+    return {"rewritten": rewritten, "uncompressed_bytes": stored_before}
+
+
+async def _main() -> None:
+    client = AsyncMongoClient(settings.MONGO_URI)
+    await init_beanie(database=client[settings.MONGO_DB], document_models=[ContractDocument, ContractPayload])
+    await init_minio_client(
+        minio_host=settings.MINIO_HOST,
+        minio_port=settings.MINIO_PORT,
+        minio_root_user=settings.MINIO_ROOT_USER,
+        minio_root_password=settings.MINIO_ROOT_PASSWORD,
+    )
+    print(await migrate_contract_payloads())
+    if settings.CONTRACT_PAYLOAD_COMPRESSION == "zstd":
+        print(await compress_contract_payloads())
+    await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
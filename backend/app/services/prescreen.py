@@ -0,0 +1,92 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional, Set
+from app.config import settings
+from app.services.classifier import ClauseClassifier
+from app.services.rule_engine import RuleEngineService
+
+
+# Risk implied by a rule-engine flag, per rule category
+RULE_CATEGORY_RISK = {
+    "HIGH_RISK_TERMS": 1.0,
+    "MISSING_ELEMENTS": 0.7,
+    "FORMAT_CONSISTENCY": 0.4,
+}
+
+
+@dataclass
+class ClauseSignal:
+    clause_id: str
+    clause_type: str
+    classifier_risk: float
+    rule_flags: List[str] = field(default_factory=list)
+    policy_similarity: Optional[float] = None
+    risk: float = 0.0
+
+
+@dataclass
+class PrescreenResult:
+    required: Set[Hashable]
+    skipped: Set[Hashable]
+    specialist_risk: Dict[Hashable, float]
+    clause_signals: Dict[str, ClauseSignal]
+
+
+def _clause_signals(clauses: List[Any], policy_hits: Optional[Dict[str, List[Any]]]) -> Dict[str, ClauseSignal]:
+    """
+    Local risk estimate per clause: the classifier risk, raised by any rule-engine flag.
+    Clauses nearly identical to an approved policy clause, with no flags, count half.
+    """
+    classified = ClauseClassifier().classify_clauses(clauses)
+    rules = RuleEngineService(logger=lambda *args: None)
+
+    signals: Dict[str, ClauseSignal] = {}
+    for clause, classified_clause in zip(clauses, classified):
+        flags = rules.apply_rules(clause.text, {"clause_type": classified_clause.clause_type})
+        signal = ClauseSignal(
+            clause_id=clause.clause_id,
+            clause_type=classified_clause.clause_type,
+            classifier_risk=classified_clause.risk_score,
+            rule_flags=[f["rule_id"] for f in flags],
+        )
+        risk = max([classified_clause.risk_score] + [RULE_CATEGORY_RISK.get(f["category"], 0.5) for f in flags])
+
+        # Keyword-only hybrid hits carry no similarity (score 0.0); they neither count as a match nor as a miss
+        similarities = [h.score for h in (policy_hits or {}).get(clause.clause_id) or [] if h.rank_score is None or h.score > 0]
+        if similarities:
+            signal.policy_similarity = max(similarities)
+            if not flags and signal.policy_similarity >= settings.COMPLIANCE_PRESCREEN_POLICY_MATCH:
+                risk *= 0.5
+        signal.risk = risk
+        signals[clause.clause_id] = signal
+    return signals
+
+
+def prescreen_specialists(
+    clauses: List[Any],
+    clause_groups: Dict[Hashable, Set[str]],
+    default_specialist: Hashable,
+    policy_hits: Optional[Dict[str, List[Any]]] = None,
+    threshold: Optional[float] = None,
+) -> PrescreenResult:
+    """
+    Decide which specialists a contract needs. Each clause is routed like fan-out mode
+    (clause_groups, unrouted types go to default_specialist); a specialist is required
+    when the riskiest of its clauses reaches the threshold, and skipped otherwise.
+    """
+    threshold = settings.COMPLIANCE_PRESCREEN_THRESHOLD if threshold is None else threshold
+    signals = _clause_signals(clauses, policy_hits)
+
+    specialist_risk: Dict[Hashable, float] = {specialist: 0.0 for specialist in clause_groups}
+    specialist_risk.setdefault(default_specialist, 0.0)
+    for signal in signals.values():
+        targets = [s for s, types in clause_groups.items() if signal.clause_type in types]
+        for specialist in targets or [default_specialist]:
+            specialist_risk[specialist] = max(specialist_risk[specialist], signal.risk)
+
+    required = {s for s, risk in specialist_risk.items() if risk >= threshold}
+    return PrescreenResult(
+        required=required,
+        skipped=set(specialist_risk) - required,
+        specialist_risk=specialist_risk,
+        clause_signals=signals,
+    )
@@ -0,0 +1,96 @@
+import asyncio
+import time
+from typing import Any, Dict, List
+from qdrant_client.models import SearchRequest
+from app.config import settings
+from app.qdrant import close_qdrant_client, get_qdrant_client
+from app.services.embedding import TextDocumentProcessor
+
+
+# Bytes per dimension of the in-RAM search vectors for each quantization mode
+BYTES_PER_DIMENSION = {"none": 4.0, "scalar": 1.0, "binary": 1 / 8}
+
+
+async def run_recall_benchmark(sample_size: int = 100, top_k: int = 10) -> Dict[str, Any]:
+    """
+    Recall@k of the configured search (HNSW ef, quantization, rescoring) against exact
+    full-precision search, using stored template vectors as queries, plus an estimate
+    of the vector memory footprint with and without quantization.
+    """
+    qdrant = TextDocumentProcessor.qdrant
+    collection_name = TextDocumentProcessor.collection_name
+    if qdrant is None:
+        raise RuntimeError("TextDocumentProcessor is not initialized")
+
+    points, _ = await qdrant.scroll(
+        collection_name=collection_name,
+        limit=sample_size,
+        with_payload=False,
+        with_vectors=True,
+    )
+    queries: List[List[float]] = [p.vector for p in points if p.vector]
+    info = await qdrant.get_collection(collection_name)
+    dimension = info.config.params.vectors.size
+    points_count = info.points_count or 0
+    mode = TextDocumentProcessor._quantization_mode(info.config.quantization_config)
+
+    result: Dict[str, Any] = {
+        "collection": collection_name,
+        "points": points_count,
+        "dimension": dimension,
+        "quantization": mode,
+        "vectors_on_disk": bool(info.config.params.vectors.on_disk),
+        "hnsw_ef": settings.QDRANT_HNSW_EF,
+        "queries": len(queries),
+        "top_k": top_k,
+        "float32_memory_mb": round(points_count * dimension * 4 / 2**20, 2),
+        "search_memory_mb": round(points_count * dimension * BYTES_PER_DIMENSION.get(mode, 4.0) / 2**20, 2),
+    }
+    if not queries:
+        result["recall"] = None
+        return result
+
+    started = time.perf_counter()
+    approximate = await qdrant.search_batch(
+        collection_name=collection_name,
+        requests=[
+            SearchRequest(vector=q, limit=top_k, params=TextDocumentProcessor.search_params())
+            for q in queries
+        ],
+    )
+    approximate_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    exact = await qdrant.search_batch(
+        collection_name=collection_name,
+        requests=[
+            SearchRequest(vector=q, limit=top_k, params=TextDocumentProcessor.search_params(exact=True))
+            for q in queries
+        ],
+    )
+    exact_seconds = time.perf_counter() - started
+
+    recalls = []
+    for approx_hits, exact_hits in zip(approximate, exact):
+        expected = {str(h.id) for h in exact_hits}
+        if expected:
+            recalls.append(len(expected & {str(h.id) for h in approx_hits}) / len(expected))
+
+    result.update({
+        "recall": round(sum(recalls) / len(recalls), 4) if recalls else None,
+        "min_recall": round(min(recalls), 4) if recalls else None,
+        "approximate_ms_per_query": round(approximate_seconds * 1000 / len(queries), 2),
+        "exact_ms_per_query": round(exact_seconds * 1000 / len(queries), 2),
+    })
+    return result
+
+
+async def _main() -> None:
+    TextDocumentProcessor.qdrant = get_qdrant_client()
+    TextDocumentProcessor.collection_name = settings.QDRANT_COLLECTION
+    print(await run_recall_benchmark())
+    await close_qdrant_client()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
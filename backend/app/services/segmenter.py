@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
 from app.config import settings
+from app.services.llm_limiter import LLMPriority, run_agent
 
 
 class ExtractedClause(BaseModel):
@@ -20,7 +21,7 @@ class ClauseExtractionResult(BaseModel):
     total_clauses: int
 
 
-def extract_clauses(contract_text: str) -> ClauseExtractionResult:
+async def extract_clauses(contract_text: str) -> ClauseExtractionResult:
     print("---------------------------------")
     print(contract_text)
     agent = Agent(
@@ -54,5 +55,5 @@ def extract_clauses(contract_text: str) -> ClauseExtractionResult:
     {contract_text}
     """
     
-    response = agent.run(prompt)
+    response = await run_agent(agent, prompt, LLMPriority.BATCH)
     return response.content
\ No newline at end of file
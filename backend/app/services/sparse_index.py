@@ -0,0 +1,102 @@
+import math
+import re
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Keeps statute and article numbers such as "2016/679", "12.3" or "art-28" as one token
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[./\-][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-cased word tokens plus adjacent-word bigrams, so phrases like "force majeure" match as a unit"""
+    words = _TOKEN_RE.findall(text.lower())
+    return words + [f"{a}_{b}" for a, b in zip(words, words[1:])]
+
+
+class BM25Index:
+    """
+    In-memory BM25 index over policy clauses, kept beside the dense Qdrant vectors.
+    Documents are keyed by Qdrant point id and carry the point payload for filtering.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._docs: Dict[str, Tuple[Counter, int, dict]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def upsert(self, doc_id: str, text: str, payload: dict) -> None:
+        self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        length = sum(terms.values())
+        self._docs[doc_id] = (terms, length, dict(payload))
+        self._total_length += length
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
+
+    def remove(self, doc_id: str) -> None:
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return
+        terms, length, _ = doc
+        self._total_length -= length
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def remove_where(self, predicate: Callable[[dict], bool]) -> None:
+        for doc_id in [d for d, (_, _, payload) in self._docs.items() if predicate(payload)]:
+            self.remove(doc_id)
+
+    def update_payload(self, doc_ids: Iterable[str], payload: dict) -> None:
+        for doc_id in doc_ids:
+            if doc_id in self._docs:
+                self._docs[doc_id][2].update(payload)
+
+    def payload(self, doc_id: str) -> Optional[dict]:
+        doc = self._docs.get(doc_id)
+        return doc[2] if doc else None
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        predicate: Optional[Callable[[dict], bool]] = None,
+    ) -> List[Tuple[str, float]]:
+        """(doc_id, bm25 score) of the best matching documents, best first"""
+        if not self._docs:
+            return []
+        n = len(self._docs)
+        avg_length = self._total_length / n
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                length = self._docs[doc_id][1]
+                norm = tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * length / avg_length))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        if predicate is not None:
+            ranked = [(doc_id, score) for doc_id, score in ranked if predicate(self._docs[doc_id][2])]
+        return ranked[:limit]
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked id lists: each id scores sum(1 / (k + rank)) over the lists it appears in"""
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda item: item[1], reverse=True)
@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field
 from agno.agent import Agent
 from agno.models.openai import OpenAIChat
 from app.config import settings
+from app.services.llm_limiter import LLMPriority, run_agent
 
 
 class SuggestionTag(BaseModel):
@@ -96,7 +97,7 @@ def create_suggestions_agent() -> Agent:
     )
 
 
-def generate_suggestions(content: str, query: Optional[str] = None) -> SuggestionsResponse:
+async def generate_suggestions(content: str, query: Optional[str] = None) -> SuggestionsResponse:
     """
     Generate AI-powered contract clause suggestions.
     
@@ -144,7 +145,7 @@ IMPORTANT: Provide variety in your suggestions. Don't just suggest additions. Co
 Provide your suggestions as a JSON object matching the specified format with variety in suggestion types."""
     
     try:
-        response = agent.run(prompt)
+        response = await run_agent(agent, prompt, LLMPriority.INTERACTIVE)
         raw_output = (response.content or "").strip()
         
         # Clean up markdown code blocks if present
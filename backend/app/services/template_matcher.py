@@ -0,0 +1,173 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import numpy as np
+from app.config import settings
+from app.dto.policy import ClauseMatch, CoverageReport, MissingTemplateClause, TemplateCoverage
+from app.models.policy import PoStatus, Template
+from app.repositories.policy import TemplateRepository
+from app.services.embedding import TextDocumentProcessor
+
+
+@dataclass
+class TemplateClauseEntry:
+    template_id: str
+    template_name: str
+    policy_type: str
+    country: str
+    clause_id: str
+    title: str
+    mandatory: bool
+    numeric_limits: Optional[Dict[str, float]]
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class TemplateMatcher:
+    """
+    In-memory index of the clauses of all active templates: one normalised float32
+    matrix row per clause, plus the clause metadata (mandatory flag, numeric_limits).
+    Rebuilt when the policy collection version changes. Contract clauses are aligned
+    against it with a single matrix product.
+    """
+
+    entries: List[TemplateClauseEntry] = []
+    matrix: Optional[np.ndarray] = None
+    policy_version: Optional[str] = None
+    _lock: Optional[asyncio.Lock] = None
+
+    @staticmethod
+    async def _load_vectors(entries: List[TemplateClauseEntry], texts: List[str]) -> np.ndarray:
+        """Reuse the vectors already stored in Qdrant, embedding only clauses missing there"""
+        point_ids = [TextDocumentProcessor.point_id(e.template_id, e.clause_id) for e in entries]
+        stored: Dict[str, List[float]] = {}
+        for i in range(0, len(point_ids), 256):
+            points = await TextDocumentProcessor.qdrant.retrieve(
+                collection_name=TextDocumentProcessor.collection_name,
+                ids=point_ids[i:i + 256],
+                with_payload=False,
+                with_vectors=True,
+            )
+            stored.update({str(p.id): p.vector for p in points if p.vector})
+
+        missing = [i for i, point_id in enumerate(point_ids) if point_id not in stored]
+        if missing:
+            vectors = await TextDocumentProcessor.embed_texts([texts[i] for i in missing])
+            stored.update({point_ids[i]: v for i, v in zip(missing, vectors)})
+        return np.asarray([stored[point_id] for point_id in point_ids], dtype=np.float32)
+
+    @staticmethod
+    async def refresh(force: bool = False) -> None:
+        if TemplateMatcher._lock is None:
+            TemplateMatcher._lock = asyncio.Lock()
+        async with TemplateMatcher._lock:
+            version = await TemplateRepository.get_policy_version(settings.QDRANT_COLLECTION)
+            if not force and version == TemplateMatcher.policy_version and TemplateMatcher.matrix is not None:
+                return
+
+            templates = await Template.find(Template.status == PoStatus.ACTIVE).to_list()
+            entries: List[TemplateClauseEntry] = []
+            texts: List[str] = []
+            for template in templates:
+                for clause in template.clauses:
+                    entries.append(TemplateClauseEntry(
+                        template_id=str(template.id),
+                        template_name=template.name,
+                        policy_type=template.policy_type,
+                        country=template.country,
+                        clause_id=clause.clause_id,
+                        title=clause.title,
+                        mandatory=clause.mandatory,
+                        numeric_limits=clause.numeric_limits,
+                    ))
+                    texts.append(f"{clause.title}\n{clause.text}")
+
+            matrix = await TemplateMatcher._load_vectors(entries, texts) if entries else None
+            TemplateMatcher.entries = entries
+            TemplateMatcher.matrix = _normalize_rows(matrix) if matrix is not None else None
+            TemplateMatcher.policy_version = version
+            print(f"[DEBUG] Template matcher index built: {len(entries)} clauses from {len(templates)} templates")
+
+    @staticmethod
+    async def match(
+        clauses: List[Dict[str, str]],
+        template_id: Optional[str] = None,
+        policy_type: Optional[str] = None,
+        country: Optional[str] = None,
+        threshold: Optional[float] = None,
+    ) -> CoverageReport:
+        """
+        Align contract clauses ({"clause_id", "text"}) with the clauses of the selected
+        active templates. A template clause is satisfied when its most similar contract
+        clause reaches the threshold; mandatory clauses that are not are reported as gaps.
+        """
+        threshold = settings.TEMPLATE_MATCH_THRESHOLD if threshold is None else threshold
+        await TemplateMatcher.refresh()
+
+        selected = [
+            i for i, e in enumerate(TemplateMatcher.entries)
+            if (template_id is None or e.template_id == template_id)
+            and (policy_type is None or e.policy_type == policy_type)
+            and (country is None or e.country == country)
+        ]
+        if not selected or not clauses:
+            return CoverageReport(threshold=threshold, templates=[], clause_matches=[])
+
+        contract_vectors = await TextDocumentProcessor.embed_texts([c["text"] for c in clauses])
+        contract_matrix = _normalize_rows(np.asarray(contract_vectors, dtype=np.float32))
+        template_matrix = TemplateMatcher.matrix[selected]
+        # similarity[i, j]: contract clause i vs selected template clause j
+        similarity = contract_matrix @ template_matrix.T
+
+        best_contract_for_template = similarity.argmax(axis=0)
+        best_template_score = similarity.max(axis=0)
+        best_template_for_contract = similarity.argmax(axis=1)
+        best_contract_score = similarity.max(axis=1)
+
+        coverage: Dict[str, TemplateCoverage] = {}
+        for column, entry_index in enumerate(selected):
+            entry = TemplateMatcher.entries[entry_index]
+            report = coverage.setdefault(entry.template_id, TemplateCoverage(
+                template_id=entry.template_id,
+                template_name=entry.template_name,
+                policy_type=entry.policy_type,
+                country=entry.country,
+            ))
+            score = float(best_template_score[column])
+            satisfied = score >= threshold
+            if entry.mandatory:
+                report.mandatory_total += 1
+                if satisfied:
+                    report.mandatory_satisfied += 1
+                else:
+                    report.missing.append(MissingTemplateClause(
+                        clause_id=entry.clause_id,
+                        title=entry.title,
+                        best_score=score,
+                        closest_contract_clause_id=clauses[int(best_contract_for_template[column])]["clause_id"],
+                    ))
+        for report in coverage.values():
+            report.coverage = report.mandatory_satisfied / report.mandatory_total if report.mandatory_total else 1.0
+
+        clause_matches = []
+        for row, clause in enumerate(clauses):
+            score = float(best_contract_score[row])
+            entry = TemplateMatcher.entries[selected[int(best_template_for_contract[row])]]
+            clause_matches.append(ClauseMatch(
+                contract_clause_id=clause["clause_id"],
+                template_id=entry.template_id if score >= threshold else None,
+                template_clause_id=entry.clause_id if score >= threshold else None,
+                template_clause_title=entry.title if score >= threshold else None,
+                score=score,
+                numeric_limits=entry.numeric_limits if score >= threshold else None,
+            ))
+
+        return CoverageReport(
+            threshold=threshold,
+            templates=sorted(coverage.values(), key=lambda r: r.coverage),
+            clause_matches=clause_matches,
+        )
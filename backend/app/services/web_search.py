@@ -0,0 +1,149 @@
+import json
+import os
+import re
+import sqlite3
+import time
+from typing import Dict, List, Optional
+from app.config import settings
+
+
+# Words that do not change what a search engine returns
+_STOPWORDS = {"a", "an", "the", "of", "for", "in", "on", "to", "and", "or", "is", "are", "what", "with"}
+
+
+def normalize_query(query: str) -> str:
+    """Cache key for a query: lower-cased, punctuation and stopwords dropped, tokens sorted"""
+    tokens = re.findall(r"[a-z0-9]+", query.lower())
+    return " ".join(sorted({t for t in tokens if t not in _STOPWORDS})) or query.strip().lower()
+
+
+class WebSearchCache:
+    """Persistent query -> results cache in a local SQLite file, entries expire after a TTL"""
+
+    def __init__(self, path: str, ttl_seconds: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS web_search_cache ("
+                "query_key TEXT PRIMARY KEY, results TEXT NOT NULL, fetched_at REAL NOT NULL)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call: tools run in worker threads
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[List[Dict]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT results, fetched_at FROM web_search_cache WHERE query_key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        results, fetched_at = row
+        if not allow_stale and time.time() - fetched_at > self.ttl_seconds:
+            return None
+        return json.loads(results)
+
+    def set(self, key: str, results: List[Dict]) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO web_search_cache (query_key, results, fetched_at) VALUES (?, ?, ?)",
+                (key, json.dumps(results), time.time()),
+            )
+
+
+class DuckDuckGoBackend:
+    def search(self, query: str, max_results: int) -> List[Dict]:
+        from duckduckgo_search import DDGS
+
+        return [
+            {"title": r.get("title", ""), "snippet": r.get("body", ""), "url": r.get("href", "")}
+            for r in DDGS().text(keywords=query, max_results=max_results) or []
+        ]
+
+
+class StubBackend:
+    """
+    Offline backend: answers from a JSON file mapping normalised queries to result
+    lists (WEB_SEARCH_STUB_PATH), and returns no results for anything else.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.fixtures: Dict[str, List[Dict]] = {}
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.fixtures = {normalize_query(q): r for q, r in json.load(f).items()}
+
+    def search(self, query: str, max_results: int) -> List[Dict]:
+        return self.fixtures.get(normalize_query(query), [])[:max_results]
+
+
+_cache: Optional[WebSearchCache] = None
+_backend = None
+
+
+def _get_cache() -> WebSearchCache:
+    global _cache
+    if _cache is None:
+        _cache = WebSearchCache(settings.WEB_SEARCH_CACHE_PATH, settings.WEB_SEARCH_CACHE_TTL)
+    return _cache
+
+
+def _get_backend():
+    global _backend
+    if _backend is None:
+        if settings.WEB_SEARCH_BACKEND == "stub":
+            _backend = StubBackend(settings.WEB_SEARCH_STUB_PATH)
+        else:
+            _backend = DuckDuckGoBackend()
+    return _backend
+
+
+def search(query: str, max_results: Optional[int] = None) -> List[Dict]:
+    """
+    Cached web search. A fresh cache entry is returned without touching the network;
+    when the backend fails, a stale entry is used rather than nothing. Empty results
+    are not cached, so the query is retried on the next call.
+    """
+    max_results = max_results or settings.WEB_SEARCH_MAX_RESULTS
+    key = normalize_query(query)
+    cache = _get_cache()
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached[:max_results]
+
+    try:
+        results = _get_backend().search(query, max_results)
+    except Exception as e:
+        stale = cache.get(key, allow_stale=True)
+        if stale is None:
+            raise
+        print(f"[WARNING] Web search failed ({e}), using stale cached results for '{query}'")
+        return stale[:max_results]
+
+    # An empty answer may be a backend hiccup; caching it would hide real results for the whole TTL
+    if results:
+        cache.set(key, results)
+    return results
+
+
+def check_external_web_data(query: str) -> str:
+    """Uses web search to provide external context to the agent."""
+    try:
+        results = search(query)
+        if not results:
+            return f"No external data found for '{query}'."
+
+        formatted_results = "\n---\n".join([
+            f"Title: {r['title']}\nSnippet: {r['snippet']}\nURL: {r['url']}"
+            for r in results
+        ])
+
+        return f"External search results for '{query}':\n{formatted_results}"
+    except Exception as e:
+        return f"External search failed: {str(e)}. No external data found for '{query}'."
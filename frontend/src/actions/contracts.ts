@@ -127,6 +127,31 @@ export interface ContractDocument {
   recommendation?: string;
 }
 
+export interface ContractSummary {
+  _id: string;
+  file_name: string;
+  file_id: string;
+  category?: string;
+  status: ContractStatus;
+  created_at: string;
+  uploaded_at?: string;
+  version: number;
+  last_updated?: string;
+  compliance_score?: number;
+  clause_count: number;
+  risk_count: number;
+}
+
+export interface ContractUpdateResponse {
+  _id: string;
+  version: number;
+  last_updated: string;
+  status?: ContractStatus;
+  file_name?: string;
+  category?: string;
+  content_length?: number;
+}
+
 export interface ContractsListParams {
   status?: ContractStatus;
   skip?: number;
@@ -146,7 +171,7 @@ export const contractActions = {
   // Get list of contracts
   async listContracts(
     params?: ContractsListParams
-  ): Promise<ContractDocument[]> {
+  ): Promise<ContractSummary[]> {
     const queryParams = new URLSearchParams();
     if (params?.status) queryParams.append("status", params.status);
     if (params?.skip) queryParams.append("skip", params.skip.toString());
@@ -155,7 +180,7 @@ export const contractActions = {
     if (params?.sort_order) queryParams.append("sort_order", params.sort_order);
 
     const queryString = queryParams.toString();
-    return api.get<ContractDocument[]>(
+    return api.get<ContractSummary[]>(
       `/contract${queryString ? `?${queryString}` : ""}`
     );
   },
@@ -236,8 +261,8 @@ export const contractActions = {
   async updateContractStatus(
     id: string,
     status: ContractStatus
-  ): Promise<ContractDocument> {
-    return api.put<ContractDocument>(`/contract/${id}/status`, {
+  ): Promise<ContractUpdateResponse> {
+    return api.put<ContractUpdateResponse>(`/contract/${id}/status`, {
       new_status: status,
     });
   },
@@ -251,7 +276,7 @@ export const contractActions = {
       category?: string;
     }
   ): Promise<ContractDocument> {
-    await api.put<ContractDocument>(`/contract/${id}`, data);
+    await api.put<ContractUpdateResponse>(`/contract/${id}`, data);
     await this.extractClauses(id);
     await this.complianceCheck(id);
     return this.getContract(id);